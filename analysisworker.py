@@ -0,0 +1,99 @@
+#Runs GUI element analysis in a separate process so the generator window stays responsive.
+#The worker reads and parses the file, then streams messages back through a queue:
+#    ("framework", name)           detected framework, or None
+#    ("elements", [(name, type)])  a batch of newly found elements
+#    ("progress", fraction)        how far through the file the extraction is
+#    ("timing", (phase, seconds))  parse and extract times, only sent when helpstats is enabled
+#    ("done", None) / ("error", message)
+#The window polls with AnalysisWorker.poll from Tk's after() loop and can cancel at any time.
+
+import ast
+import multiprocessing
+import queue
+import time
+
+from extractioncache import ExtractionCache
+from guianalyzer import GuiAnalyzer, load_rules, prescan_gui_framework, registered_rules
+from helpstats import stats
+
+BATCH_SIZE = 500
+
+
+def run_analysis(file_path, cache_dir, results, rules=()):
+    try:
+        load_rules(rules)  # Frameworks and widget types registered in the parent
+        with open(file_path, "rb") as file:
+            content = file.read()
+        analyzer = GuiAnalyzer()
+        cache = ExtractionCache(cache_dir)
+        cached = cache.get(file_path, content)
+        if cached is not None:
+            framework, element_info = cached
+            results.put(("framework", framework))
+            items = list(element_info.items())
+            for start in range(0, len(items), BATCH_SIZE):
+                results.put(("elements", items[start:start + BATCH_SIZE]))
+            results.put(("done", None))
+            return
+
+        if prescan_gui_framework(content) is None:
+            # Not GUI code: no need to build the syntax tree at all
+            cache.put(file_path, content, None, {})
+            results.put(("framework", None))
+            results.put(("done", None))
+            return
+
+        start = time.perf_counter()
+        tree = ast.parse(content, file_path)
+        if stats.enabled:
+            results.put(("timing", ("parse", time.perf_counter() - start)))
+        start = time.perf_counter()
+        analyzer.detect_gui_framework(tree)
+        results.put(("framework", analyzer.gui_framework))
+        if analyzer.gui_framework:
+            line_count = max(content.count(b"\n"), 1)
+            for batch, lineno in analyzer.iter_gui_elements(tree, BATCH_SIZE):
+                if batch:
+                    results.put(("elements", batch))
+                if lineno:
+                    results.put(("progress", min(lineno / line_count, 1.0)))
+        if stats.enabled:
+            results.put(("timing", ("extract", time.perf_counter() - start)))
+        cache.put(file_path, content, analyzer.gui_framework, analyzer.element_info)
+        results.put(("done", None))
+    except Exception as e:
+        results.put(("error", f"{type(e).__name__}: {e}"))
+
+
+class AnalysisWorker:
+    def __init__(self, file_path, cache_dir=None):
+        context = multiprocessing.get_context("spawn")  # Never fork a process that holds a Tk interpreter
+        self.results = context.Queue()
+        self.process = context.Process(target=run_analysis, args=(file_path, cache_dir, self.results, registered_rules()),
+                                       name="help-analysis", daemon=True)
+        self.finished = False
+
+    def start(self):
+        self.process.start()
+
+    def poll(self, max_messages=50):
+        # Returns the messages that have arrived so far without blocking
+        messages = []
+        while len(messages) < max_messages:
+            try:
+                message = self.results.get_nowait()
+            except queue.Empty:
+                if not self.process.is_alive() and not self.finished and self.results.empty():
+                    messages.append(("error", "Analysis process exited unexpectedly."))
+                    self.finished = True
+                break
+            messages.append(message)
+            if message[0] in ("done", "error"):
+                self.finished = True
+                break
+        return messages
+
+    def cancel(self):
+        if self.process.is_alive():
+            self.process.terminate()
+        self.finished = True
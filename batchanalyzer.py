@@ -0,0 +1,112 @@
+#Headless batch analyzer for whole source trees.
+#Runs GuiAnalyzer over every Python module found under the given paths on a process pool
+#and writes a skeleton .ftxt help file per module, or a single merged one, without Tk.
+#
+#Usage:
+#    python batchanalyzer.py src/ -o help/            # one .ftxt per GUI module
+#    python batchanalyzer.py src/ --merge app.ftxt    # one merged .ftxt
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from extractioncache import ExtractionCache
+from guianalyzer import GuiAnalyzer, load_rules, registered_rules, skeleton_help_content
+
+SKIP_DIRS = {"__pycache__", "venv", "env", "node_modules"}
+
+
+def find_python_files(paths):
+    for path in paths:
+        if os.path.isfile(path):
+            yield path
+            continue
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith(".") and d not in SKIP_DIRS)
+            for filename in sorted(filenames):
+                if filename.endswith(".py"):
+                    yield os.path.join(dirpath, filename)
+
+
+def analyze_path(file_path, cache_dir=None, use_cache=True):
+    try:
+        analyzer = GuiAnalyzer()
+        cache = ExtractionCache(cache_dir) if use_cache else None
+        framework = analyzer.analyze_file(file_path, cache)
+        return file_path, framework, analyzer.element_info, None
+    except (OSError, SyntaxError, ValueError, RecursionError, MemoryError) as e:
+        # Deeply nested or huge generated modules fail in ast.parse; report them like any other bad file
+        return file_path, None, {}, f"{type(e).__name__}: {e}"
+
+
+def analyze_paths(file_paths, jobs=None, cache_dir=None, use_cache=True):
+    worker = partial(analyze_path, cache_dir=cache_dir, use_cache=use_cache)
+    if jobs == 1 or len(file_paths) < 2:
+        return [worker(file_path) for file_path in file_paths]
+    chunksize = max(1, len(file_paths) // ((jobs or os.cpu_count() or 1) * 4))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=load_rules, initargs=(registered_rules(),)) as executor:
+        return list(executor.map(worker, file_paths, chunksize=chunksize))
+
+
+def write_help_file(file_path, content):
+    os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+    with open(file_path, "w") as file:
+        json.dump(content, file, indent=2)
+
+
+def module_output_path(file_path, roots, output_dir):
+    for root in roots:
+        if os.path.isdir(root):
+            rel_path = os.path.relpath(file_path, root)
+            if not rel_path.startswith(os.pardir):
+                return os.path.join(output_dir, os.path.splitext(rel_path)[0] + ".ftxt")
+    return os.path.join(output_dir, os.path.splitext(os.path.basename(file_path))[0] + ".ftxt")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract GUI elements from Python sources into skeleton .ftxt help files.")
+    parser.add_argument("paths", nargs="+", help="Python files or directories to scan")
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument("-o", "--output-dir", help="write one .ftxt per GUI module into this directory")
+    output.add_argument("-m", "--merge", metavar="FILE", help="write all elements into a single .ftxt file")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--cache-dir", default=None, help="extraction cache directory")
+    parser.add_argument("--no-cache", action="store_true", help="always re-parse every module")
+    parser.add_argument("-q", "--quiet", action="store_true", help="only report errors")
+    args = parser.parse_args(argv)
+
+    file_paths = list(find_python_files(args.paths))
+    results = analyze_paths(file_paths, args.jobs, args.cache_dir, not args.no_cache)
+
+    merged = GuiAnalyzer()
+    gui_modules = 0
+    errors = 0
+    for file_path, framework, element_info, error in results:
+        if error:
+            errors += 1
+            print(f"{file_path}: {error}", file=sys.stderr)
+            continue
+        if not framework:
+            continue
+        gui_modules += 1
+        if args.merge:
+            for name, element_type in element_info.items():
+                merged.add_element(name, element_type)
+        else:
+            out_path = module_output_path(file_path, args.paths, args.output_dir)
+            write_help_file(out_path, skeleton_help_content(element_info))
+        if not args.quiet:
+            print(f"{file_path}: {framework}, {len(element_info)} elements")
+
+    if args.merge:
+        write_help_file(args.merge, skeleton_help_content(merged.element_info))
+
+    if not args.quiet:
+        print(f"Scanned {len(file_paths)} files, {gui_modules} GUI modules, {errors} errors")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+#Benchmark for GUI element extraction.
+#Generates synthetic Tkinter, PySimpleGUI and PyQt modules of increasing size and times
+#ast.parse and GuiAnalyzer.extract_gui_elements separately. Extraction time per line should
+#stay flat as the module grows, and deeply nested expressions must not raise RecursionError.
+#
+#Usage:
+#    python benchmarks/bench_extraction.py [--sizes 10000 50000 100000]
+import argparse
+import ast
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from guianalyzer import GuiAnalyzer  # noqa: E402
+from synthetic import SOURCE_GENERATORS, nested_source  # noqa: E402
+
+
+def time_source(content):
+    start = time.perf_counter()
+    tree = ast.parse(content)
+    parsed = time.perf_counter()
+    analyzer = GuiAnalyzer()
+    analyzer.detect_gui_framework(tree)
+    analyzer.extract_gui_elements(tree)
+    done = time.perf_counter()
+    return parsed - start, done - parsed, len(analyzer.element_info)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark GUI element extraction.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 25000, 50000, 100000])
+    args = parser.parse_args(argv)
+
+    print(f"{'source':<12} {'lines':>8} {'elements':>9} {'parse s':>9} {'extract s':>10} {'extract us/line':>16}")
+    for name, generator in SOURCE_GENERATORS.items():
+        for size in args.sizes:
+            content = generator(size)
+            lines = content.count("\n")
+            parse_time, extract_time, elements = time_source(content)
+            print(f"{name:<12} {lines:>8} {elements:>9} {parse_time:>9.3f} {extract_time:>10.3f} "
+                  f"{extract_time / lines * 1e6:>16.2f}")
+
+    # Left-deep BinOp chain, close to the nesting ast.parse itself accepts
+    content = nested_source(900)
+    parse_time, extract_time, elements = time_source(content)
+    print(f"{'nested':<12} {900:>8} {elements:>9} {parse_time:>9.3f} {extract_time:>10.3f} "
+          f"{extract_time / 900 * 1e6:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#Memory benchmark for the in-memory help document model.
+#Loads synthetic help files and measures with tracemalloc how much memory the loaded entries take
+#as plain .ftxt dicts (one dict per line plus one tag dict per line) and as tuples of helpmodel Line
+#objects with interned styles, and checks that converting back gives the original content.
+#
+#Usage:
+#    python benchmarks/bench_model_memory.py [--elements 1000 10000] [--lines 6]
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ftxtformat import read_ftxt, write_ftxt  # noqa: E402
+from helpindex import restructure_help_content  # noqa: E402
+from helpmodel import entries_from_ftxt, entries_to_ftxt  # noqa: E402
+from synthetic import help_content  # noqa: E402
+
+
+def measure(load):
+    gc.collect()
+    tracemalloc.start()
+    data = load()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return data, size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure memory used by loaded help entries.")
+    parser.add_argument("--elements", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--lines", type=int, default=6, help="lines per element")
+    args = parser.parse_args(argv)
+
+    print(f"{'elements':>9} {'dict MB':>9} {'model MB':>9} {'dict B/elem':>12} {'model B/elem':>13} {'ratio':>6}")
+    for elements in args.elements:
+        path = os.path.join(tempfile.mkdtemp(prefix="helpgen-mem-"), "help.ftxt")
+        write_ftxt(path, help_content(elements, args.lines))
+        dicts, dict_size = measure(lambda: restructure_help_content(read_ftxt(path)))
+        model, model_size = measure(lambda: entries_from_ftxt(restructure_help_content(read_ftxt(path))))
+        assert entries_to_ftxt(model) == dicts, "conversion is not lossless"
+        os.remove(path)
+        print(f"{elements:>9} {dict_size / 1e6:>9.2f} {model_size / 1e6:>9.2f} {dict_size / elements:>12.0f} "
+              f"{model_size / elements:>13.0f} {dict_size / model_size:>6.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+#Benchmark harness for the help file generator.
+#Times GUI element extraction, help loading and help file serialization on synthetic inputs, and,
+#when a display is available (or Xvfb can be started), editor encode/decode, help rendering and
+#F1-to-window latency. Results are written as JSON tagged with the git commit, so regressions can
+#be tracked per commit.
+#
+#Usage:
+#    python benchmarks/run_benchmarks.py [--quick] [--repeat 5] [--output results.json] [--no-gui]
+import argparse
+import ast
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from contextualhelp import ContextualHelp  # noqa: E402
+from ftxtformat import write_ftxt  # noqa: E402
+from guianalyzer import GuiAnalyzer  # noqa: E402
+from helpindex import compile_help, restructure_help_content  # noqa: E402
+from synthetic import SOURCE_GENERATORS, help_content  # noqa: E402
+
+
+def measure(function, repeat):
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        runs.append(time.perf_counter() - start)
+    return runs
+
+
+class Results:
+    def __init__(self, repeat):
+        self.repeat = repeat
+        self.items = []
+
+    def add(self, name, params, runs):
+        self.items.append({
+            "name": name,
+            "params": params,
+            "min": min(runs),
+            "median": statistics.median(runs),
+            "runs": runs
+        })
+        print(f"{name:<28} {json.dumps(params):<42} median {statistics.median(runs) * 1000:10.2f} ms", file=sys.stderr)
+
+    def run(self, name, params, function, repeat=None):
+        self.add(name, params, measure(function, repeat or self.repeat))
+
+
+def bench_extraction(results, sizes):
+    for framework, generator in SOURCE_GENERATORS.items():
+        for size in sizes:
+            tree = ast.parse(generator(size))
+
+            def extract():
+                analyzer = GuiAnalyzer()
+                analyzer.detect_gui_framework(tree)
+                analyzer.extract_gui_elements(tree)
+
+            results.run("extract_gui_elements", {"framework": framework, "lines": size}, extract)
+
+
+def bench_help_files(results, sizes, work_dir):
+    for elements in sizes:
+        content = help_content(elements)
+        paths = {}
+        for label, version, compression in (("v1", 1, None), ("v2", 2, None), ("v2-gzip", 2, "gzip")):
+            paths[label] = os.path.join(work_dir, f"help_{elements}_{label}.ftxt")
+            results.run("save_help_file", {"elements": elements, "format": label},
+                        lambda: write_ftxt(paths[label], content, version, compression))
+            results.run("load_help_info", {"elements": elements, "format": label},
+                        lambda: ContextualHelp(paths[label]))
+
+        compiled = compile_help(paths["v1"], os.path.join(work_dir, f"help_{elements}.fhlp"))
+        results.run("load_help_info", {"elements": elements, "format": "fhlp"}, lambda: ContextualHelp(compiled))
+        help_info = ContextualHelp(compiled).help_info
+        element_id = f"element_{elements // 2}"
+
+        def lookup():
+            help_info.decoded.clear()  # Time the decode, not the per-entry cache
+            return help_info[element_id]
+
+        results.run("compiled_lookup", {"elements": elements}, lookup)
+
+
+def start_display():
+    # Returns (display available, Xvfb process to stop afterwards)
+    if os.environ.get("DISPLAY"):
+        return True, None
+    xvfb = shutil.which("Xvfb")
+    if not xvfb:
+        return False, None
+    display = ":%d" % (90 + os.getpid() % 9)
+    process = subprocess.Popen([xvfb, display, "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    socket_path = "/tmp/.X11-unix/X" + display[1:]
+    for _ in range(50):
+        if os.path.exists(socket_path):
+            os.environ["DISPLAY"] = display
+            return True, process
+        time.sleep(0.1)
+    process.terminate()
+    return False, None
+
+
+def bench_gui(results, sizes, work_dir):
+    import tkinter as tk
+    from helpfilegenerator import FormattedTextEditor
+    from helprender import compile_render_plan, render_plan
+
+    root = tk.Tk()
+    root.withdraw()
+    frame = tk.Frame(root)
+    editor = FormattedTextEditor(frame)
+    for elements in sizes:
+        # One long help page made of every line of a synthetic help file
+        lines = [line for entry in help_content(elements // 10 or 1)["MainWindow"]["elements"].values() for line in entry]
+        params = {"lines": len(lines)}
+        results.run("decode_formatted_text", params, lambda: (editor.decode_formatted_text(lines), root.update()))
+        results.run("encode_formatted_text", params, editor.encode_formatted_text)
+
+        viewer = tk.Text(frame)
+
+        def apply_formatting():
+            viewer.delete("1.0", tk.END)
+            render_plan(viewer, compile_render_plan(lines))
+            root.update()
+
+        results.run("apply_formatting", params, apply_formatting)
+        viewer.destroy()
+
+        help_file = os.path.join(work_dir, f"gui_{elements}.ftxt")
+        write_ftxt(help_file, help_content(elements))
+        help_system = ContextualHelp(help_file, master=root)
+        element_ids = list(restructure_help_content(help_content(min(elements, 50)))["MainWindow"]["elements"])
+
+        def press_f1():
+            # Time from the F1 handler call until the help window has been drawn
+            for element_id in element_ids[:10]:
+                help_system.display_help(element_id, "tkinter")
+                root.update()
+                for help_window in list(help_system.get_window_pool().busy):
+                    help_window.close()
+
+        results.add("f1_to_window", {"elements": elements},
+                    [run / 10 for run in measure(press_f1, results.repeat)])
+    root.destroy()
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_DIR, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the help file generator benchmarks.")
+    parser.add_argument("--quick", action="store_true", help="small inputs, for a fast smoke run")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write JSON results to this file instead of stdout")
+    parser.add_argument("--no-gui", action="store_true", help="skip the benchmarks that need a display")
+    args = parser.parse_args(argv)
+
+    source_sizes = [2000] if args.quick else [10000, 50000]
+    help_sizes = [200] if args.quick else [1000, 10000]
+    results = Results(args.repeat)
+    work_dir = tempfile.mkdtemp(prefix="helpgen-bench-")
+    os.chdir(REPO_DIR)
+    xvfb = None
+    gui = False
+    try:
+        bench_extraction(results, source_sizes)
+        bench_help_files(results, help_sizes, work_dir)
+        if not args.no_gui:
+            gui, xvfb = start_display()
+            if gui:
+                bench_gui(results, help_sizes, work_dir)
+            else:
+                print("No display and no Xvfb found; skipping GUI benchmarks", file=sys.stderr)
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "gui": gui,
+        "results": results.items
+    }
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+#Synthetic inputs for the benchmarks: large Tkinter, PySimpleGUI and PyQt sources and large help files.
+#Everything is generated deterministically from the size arguments, so results are comparable per commit.
+
+import random
+
+STYLES = [
+    {"bold": True, "family_Arial": True, "size_14": True, "color_#008000": True},
+    {"family_Calibri": True, "size_12": True},
+    {"italic": True, "family_Calibri": True, "size_12": True},
+    {}
+]
+WORDS = ("the help file generator element button entry press select save open text format window "
+         "field value list choose enter click").split()
+
+
+def tkinter_source(lines):
+    out = ["import tkinter as tk", "from tkinter import ttk", "", "def build(root):"]
+    i = 0
+    while len(out) < lines:
+        out.append(f"    frame{i} = ttk.Frame(root)")
+        out.append(f"    ttk.Label(frame{i}, text='Label {i}', name='label_{i}').pack()")
+        out.append(f"    tk.Entry(frame{i}, name='entry_{i}').pack()")
+        out.append(f"    ttk.Button(frame{i}, text='Go', name='button_{i}', command=lambda: None).pack()")
+        i += 1
+    return "\n".join(out) + "\n"
+
+
+def pysimplegui_source(lines):
+    out = ["import PySimpleGUI as sg", "", "layout = ["]
+    i = 0
+    while len(out) < lines:
+        out.append(f"    [sg.Text('Field {i}', key='text_{i}'), sg.InputText(key='input_{i}')],")
+        i += 1
+    out.append("]")
+    return "\n".join(out) + "\n"
+
+
+def pyqt_source(lines):
+    out = ["from PyQt5 import QtWidgets", "", "class Window(QtWidgets.QWidget):", "    def setup(self):"]
+    i = 0
+    while len(out) < lines:
+        out.append(f"        self.button_{i} = QtWidgets.QPushButton('Button {i}')")
+        out.append(f"        self.edit_{i} = QtWidgets.QLineEdit()")
+        i += 1
+    return "\n".join(out) + "\n"
+
+
+def nested_source(depth):
+    expr = " + ".join(f"tk.Label(root, name='label_{i}')" for i in range(depth))
+    return f"import tkinter as tk\nwidgets = {expr}\n"
+
+
+SOURCE_GENERATORS = {"tkinter": tkinter_source, "pysimplegui": pysimplegui_source, "pyqt": pyqt_source}
+
+
+def help_entry(rng, index, lines_per_element):
+    lines = [{"text": f"Element {index}", "tags": dict(STYLES[0])}]
+    for _ in range(lines_per_element - 1):
+        lines.append({"text": " ".join(rng.choice(WORDS) for _ in range(15)), "tags": dict(rng.choice(STYLES[1:]))})
+    return lines
+
+
+def help_content(elements, lines_per_element=6, seed=1):
+    rng = random.Random(seed)
+    return {
+        "General": {
+            "title": [{"text": "Synthetic Help", "tags": dict(STYLES[0])}],
+            "description": help_entry(rng, 0, lines_per_element)[1:]
+        },
+        "MainWindow": {
+            "elements": {f"element_{i}": help_entry(rng, i, lines_per_element) for i in range(elements)}
+        }
+    }
@@ -1,96 +1,599 @@
 #The ContextualHelp class is responsible for displaying help information for the different elements of the application.
 #The load_help_info method reads the help information from a JSON file and restructures it for easier access.
+#If a compiled .fhlp file (see helpindex.py) is given or is up to date next to the .ftxt, entries are decoded on demand.
+#A help bundle directory (see helpbundle.py) is loaded one shard at a time, as elements are requested.
 #The display_help method is used to display the help information for a specific element.
 #The help information is displayed in a Toplevel window with a Text widget.
+#Help windows are attached to the host application's root and kept in a small HelpWindowPool,
+#so repeated F1 presses reuse a withdrawn window instead of creating a new Tk interpreter each time.
+#Entries are held as tuples of compact helpmodel Line objects with shared styles rather than nested dicts.
+#Each entry is compiled once into a render plan (see helprender.py) and drawn from it on every display.
+#search uses a HelpSearchIndex over the help text. resolve_element_id only needs the element names, so
+#near-miss widget names find their help through a HelpIdIndex without loading or decoding any entry.
+#start_hot_reload polls the help file and swaps in only the entries whose content hash changed. Plain .ftxt
+#files are streamed and hashed per entry as stored on a worker thread, and only changed entries are converted.
+#Loading, lookup, window opening and rendering are timed through helpstats when HELPGEN_STATS is set.
+#start_prefetch is optional: on <FocusIn> it resolves the focused widget's entry at idle time and draws
+#it into a withdrawn pooled window, so F1 only has to show that window. Render plans and resolved IDs
+#are kept in bounded LRU caches.
+#In client mode (daemon=True or HELPGEN_DAEMON_SOCKET) entries come from a shared helpdaemon process,
+#with in-process loading as the fallback. helpdaemon is only imported in client mode, since it needs Unix
+#domain sockets.
 
+import hashlib
 import json
-from tkinter import Tk, Toplevel, Text, END, messagebox, font
+import os
+import sys
+import threading
+import tkinter
+from collections import OrderedDict
+from tkinter import Tk, Toplevel, Text, END, messagebox
+
+from ftxtformat import iter_ftxt_entries
+from helpbundle import ShardedHelpInfo, is_bundle
+from helpindex import CompiledHelp, fresh_compiled_path
+from helploader import DAEMON_SOCKET_ENV, help_file_signature, read_help_info
+from helpmodel import content_hash, lines_from_ftxt
+from helprender import compile_render_plan, render_plan
+from helpsearch import HelpIdIndex, HelpSearchIndex
+from helpstats import stats
+
+GENERAL_KEYS = ("title", "description")  # The General entries restructure_help_content keeps
+EMPTY_ENTRY_HASH = hashlib.sha1(b"[]").hexdigest()  # A missing title or description, which reads as []
+
+
+class LRUCache:
+    def __init__(self, size):
+        self.size = size
+        self.items = OrderedDict()
+
+    def __contains__(self, key):
+        return key in self.items
+
+    def __len__(self):
+        return len(self.items)
+
+    def get(self, key, default=None):
+        if key not in self.items:
+            return default
+        self.items.move_to_end(key)
+        return self.items[key]
+
+    def put(self, key, value):
+        self.items[key] = value
+        self.items.move_to_end(key)
+        while len(self.items) > self.size:
+            self.items.popitem(last=False)
+
+    def pop(self, key, default=None):
+        return self.items.pop(key, default)
+
+    def clear(self):
+        self.items.clear()
+
+
+class HelpWindow:
+    def __init__(self, pool):
+        self.pool = pool
+        self.window = Toplevel(pool.master)
+        self.window.withdraw()
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        self.window.bind("<Escape>", lambda event: self.close())
+        self.text_widget = Text(self.window, wrap="word")
+        self.text_widget.pack(expand=True, fill="both")
+
+    def clear(self, title):
+        self.window.title(title)
+        self.text_widget.delete("1.0", END)
+
+    def show(self):
+        self.text_widget.see("1.0")
+        self.window.deiconify()
+        self.window.lift()
+        self.window.focus_set()
+
+    def close(self):
+        self.pool.release(self)
+
+
+class HelpWindowPool:
+    def __init__(self, master, size=2, owns_master=False):
+        self.master = master
+        self.size = size
+        self.owns_master = owns_master  # True when the pool created a hidden root because there was no host
+        self.idle = []  # Withdrawn windows ready for reuse
+        self.busy = []  # Visible windows, oldest first
+        self.reserved = []  # Withdrawn windows a HelpPrefetcher has drawn into
+
+    def is_full(self):
+        # True when acquire would have to recycle a visible window
+        return not self.idle and len(self.busy) + len(self.reserved) >= self.size
+
+    def acquire(self):
+        if self.idle:
+            help_window = self.idle.pop()
+        elif len(self.busy) + len(self.reserved) < self.size or not self.busy:
+            help_window = HelpWindow(self)  # Only reserved windows are out: exceed the size rather than fail
+        else:
+            help_window = self.busy.pop(0)  # Recycle the oldest visible window
+        self.busy.append(help_window)
+        return help_window
+
+    def release(self, help_window):
+        help_window.window.withdraw()
+        if help_window in self.busy:
+            self.busy.remove(help_window)
+            self.idle.append(help_window)
+        if self.owns_master and not self.busy:
+            self.master.quit()  # End the mainloop started by ContextualHelp.show_help_window
+
+    def prefill(self):
+        while len(self.idle) + len(self.busy) + len(self.reserved) < self.size:
+            self.idle.append(HelpWindow(self))
+
+    def reserve(self):
+        # Takes a withdrawn window out of circulation for pre-rendering; never hides a visible one
+        if self.idle:
+            help_window = self.idle.pop()
+        elif len(self.busy) + len(self.reserved) < self.size:
+            help_window = HelpWindow(self)
+        else:
+            return None
+        self.reserved.append(help_window)
+        return help_window
+
+    def claim(self, help_window):
+        # A reserved window is about to be shown
+        self.reserved.remove(help_window)
+        self.busy.append(help_window)
+
+    def unreserve(self, help_window):
+        self.reserved.remove(help_window)
+        self.idle.append(help_window)
+
+    def is_help_window(self, toplevel):
+        return any(help_window.window is toplevel for help_window in self.idle + self.busy + self.reserved)
+
+
+class HelpPrefetcher:
+    # Prepares the help of the focused widget while the application is idle. At most one withdrawn window
+    # holds pre-rendered content, for the most recently focused widget with help.
+    def __init__(self, help_system, master, element_id_for=None):
+        self.help_system = help_system
+        self.master = master
+        self.element_id_for = element_id_for or (lambda widget: widget.winfo_name())
+        self.active = False
+        self.job = None
+        self.help_window = None  # Reserved pooled window with pre-rendered content
+        self.prepared_id = None  # Element ID drawn into help_window
+
+    def start(self):
+        if not self.active:
+            self.active = True
+            self.master.bind_all("<FocusIn>", self.on_focus_in, add="+")
+
+    def stop(self):
+        # bind_all cannot remove a single callback, so the handler just goes inactive
+        self.active = False
+        if self.job is not None:
+            self.master.after_cancel(self.job)
+            self.job = None
+        self.discard()
+
+    def on_focus_in(self, event):
+        widget = event.widget
+        if not self.active or isinstance(widget, str):
+            return  # Some Tk-internal widgets, like combobox popdowns, arrive as path strings
+        if self.help_system.window_pool is not None and \
+                self.help_system.window_pool.is_help_window(widget.winfo_toplevel()):
+            return
+        if self.job is not None:
+            self.master.after_cancel(self.job)
+        self.job = self.master.after_idle(self.prefetch, self.element_id_for(widget))
+
+    def prefetch(self, widget_id):
+        # Runs on every focus change, so it must stay cheap for widgets without help: IDs are resolved
+        # from the element names only, and nothing is loaded or decoded unless an entry matches
+        self.job = None
+        with stats.timer("prefetch"):
+            element_id = self.help_system.resolve_element_id(widget_id)
+            if element_id is None or element_id == self.prepared_id:
+                return
+            plan = self.help_system.get_render_plan(element_id)
+            if self.help_window is None:
+                self.help_window = self.help_system.get_window_pool().reserve()
+                if self.help_window is None:
+                    return  # Every pooled window is on screen; the plan alone is still cached
+            self.help_window.clear(help_title(element_id))
+            render_plan(self.help_window.text_widget, plan)
+            self.prepared_id = element_id
+
+    def take_window(self, element_id):
+        # Returns the pre-rendered window for element_id, or None if something else is prepared
+        if self.help_window is None or self.prepared_id != element_id:
+            return None
+        help_window = self.help_window
+        self.help_window = None
+        self.prepared_id = None
+        help_window.pool.claim(help_window)
+        return help_window
+
+    def discard(self):
+        if self.help_window is not None:
+            self.help_window.pool.unreserve(self.help_window)
+        self.help_window = None
+        self.prepared_id = None
+
+
+def help_title(element_id):
+    return f"Help - {element_id.capitalize()}"
+
+
+class HelpFileWatcher:
+    # Polls the help file from the Tk event loop. Reading and hashing a changed file happen on a worker
+    # thread; only swapping in the result runs on the Tk thread.
+    def __init__(self, help_system, master, interval=1000, on_reload=None):
+        self.help_system = help_system
+        self.master = master
+        self.interval = interval
+        self.on_reload = on_reload  # Called with (changed IDs, removed IDs) after each reload
+        self.signature = None
+        self.job = None
+        self.worker = None
+        self.pending = None  # Signature the running worker reloads for; None while it computes the baseline
+        self.result = None
+
+    def file_signature(self):
+        return help_file_signature(self.help_system.help_file)
+
+    def start(self):
+        self.signature = self.file_signature()
+        self.start_worker(None)  # Hash the loaded file, so the first reload can tell what changed
+        self.job = self.master.after(self.interval, self.poll)
+
+    def stop(self):
+        if self.job is not None:
+            self.master.after_cancel(self.job)
+            self.job = None
+        self.worker = None  # A running worker finishes on its own; its result is dropped
+
+    def start_worker(self, signature):
+        def run():
+            try:
+                if signature is None:
+                    self.result = self.help_system.scan_baseline()
+                else:
+                    self.result = self.help_system.scan_reload()
+            except (OSError, ValueError) as e:
+                self.result = e
+        self.pending = signature
+        self.result = None
+        self.worker = threading.Thread(target=run, daemon=True)
+        self.worker.start()
+
+    def finish_worker(self):
+        signature, result = self.pending, self.result
+        self.worker = None
+        if isinstance(result, Exception) or result is None:
+            return  # Probably caught mid-write; try again on the next poll
+        if result[0] is not self.help_system.help_info:
+            return  # Reloaded meanwhile by someone else; the next poll starts over
+        if signature is None:
+            self.help_system.help_hashes = result[1]
+            return
+        changed, removed = self.help_system.apply_reload(*result)
+        self.signature = signature
+        if self.on_reload and (changed or removed):
+            self.on_reload(changed, removed)
+
+    def poll(self):
+        if self.worker is not None:
+            if not self.worker.is_alive():
+                self.finish_worker()
+        else:
+            signature = self.file_signature()
+            if signature != self.signature:
+                self.start_worker(signature)
+        self.job = self.master.after(self.interval, self.poll)
+
+
+def is_plain_ftxt(help_file):
+    # True if read_help_info parses the whole .ftxt file rather than a compiled file or a bundle
+    return not is_bundle(help_file) and not help_file.endswith(".fhlp") and fresh_compiled_path(help_file) is None
+
+
+def is_remote(help_info):
+    # True for a helpdaemon.RemoteHelpInfo; the module is only loaded once client mode has been tried
+    helpdaemon = sys.modules.get("helpdaemon")
+    return helpdaemon is not None and isinstance(help_info, helpdaemon.RemoteHelpInfo)
+
+
+def scan_ftxt_entries(help_file, old_hashes, convert=True):
+    # Streams an .ftxt file and hashes every entry as stored, in the layout of restructure_help_content.
+    # Returns (element ID -> hash, element ID -> Line tuple); only entries whose hash is not the one in
+    # old_hashes (all of them if old_hashes is None) are converted.
+    hashes = {}
+    converted = {}
+    has_general = False
+    for section, key, lines, text in iter_ftxt_entries(help_file, with_text=True):
+        if section == "General":
+            has_general = True
+            if key not in GENERAL_KEYS:
+                continue
+        elif not isinstance(lines, list):
+            lines = [{"text": lines, "tags": {}}]
+        digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        hashes[key] = digest
+        if convert and (old_hashes is None or old_hashes.get(key) != digest):
+            converted[key] = lines_from_ftxt(lines)
+    if has_general:
+        for key in GENERAL_KEYS:
+            if key not in hashes:
+                hashes[key] = EMPTY_ENTRY_HASH
+                if convert and (old_hashes is None or old_hashes.get(key) != EMPTY_ENTRY_HASH):
+                    converted[key] = ()
+    return hashes, converted
 
 
 class ContextualHelp:
-    def __init__(self, help_file):
+    def __init__(self, help_file, master=None, pool_size=2, cache_size=256, daemon=None):
+        self.help_file = help_file
+        # Socket of a shared help daemon: True for the default path, False to always load in-process
+        self.daemon = os.environ.get(DAEMON_SOCKET_ENV) if daemon is None else daemon
         self.help_info = self.load_help_info(help_file)
+        self.help_hashes = None  # Element ID -> content hash, kept for hot reload
+        self.watcher = None
+        self.prefetcher = None
+        self.render_plans = LRUCache(cache_size)  # Element ID -> RenderPlan, compiled on first display
+        self.resolved_ids = LRUCache(cache_size * 4)  # Widget name -> element ID or None
+        self.search_index = None  # Built on the first search
+        self.id_index = None  # Built on the first unknown element ID
+        self.master = master  # Host application's root; defaults to the Tk default root
+        self.pool_size = pool_size
+        self.window_pool = None
+        self.owned_root = None
 
-    def load_help_info(self, help_file):
-        try:
-            with open(help_file, 'r') as file:
-                content = json.load(file)
+    def get_window_pool(self):
+        if self.window_pool is None:
+            master = self.master or getattr(tkinter, "_default_root", None)
+            if master is None:
+                # No host application: create a single hidden root once and keep it for every request
+                master = self.owned_root = Tk()
+                master.withdraw()
+            self.window_pool = HelpWindowPool(master, self.pool_size, self.owned_root is not None)
+            self.window_pool.prefill()
+        return self.window_pool
 
-            # Restructure the content for easier access
-            help_info = {}
-            if "General" in content:
-                help_info["title"] = content["General"].get("title", [])
-                help_info["description"] = content["General"].get("description", [])
+    def open_help_window(self, title):
+        with stats.timer("window_open"):
+            pool = self.get_window_pool()
+            if self.prefetcher is not None and pool.is_full():
+                self.prefetcher.discard()  # Free the reserved window rather than recycle a visible one
+            help_window = pool.acquire()
+            help_window.clear(title)
+        return help_window
 
-            if "MainWindow" in content and "elements" in content["MainWindow"]:
-                for element, data in content["MainWindow"]["elements"].items():
-                    help_info[element] = data if isinstance(data, list) else [{"text": data, "tags": {}}]
+    def show_help_window(self, help_window):
+        help_window.show()
+        if self.owned_root is not None:
+            self.owned_root.mainloop()  # Only needed when there is no host mainloop
 
-            return help_info
-        except json.JSONDecodeError:
+    def read_help_info(self, help_file):
+        if self.daemon:
+            try:
+                from helpdaemon import RemoteHelpInfo, default_socket_path, get_client
+                socket_path = default_socket_path() if self.daemon is True else self.daemon
+                return RemoteHelpInfo(help_file, get_client(socket_path))
+            except (ImportError, AttributeError):
+                pass  # No Unix domain sockets on this platform
+            except (OSError, LookupError):
+                pass  # No daemon, or it does not serve this file
+        return read_help_info(help_file)
+
+    def load_help_info(self, help_file):
+        self.help_signature = help_file_signature(help_file)  # What the loaded entries correspond to
+        try:
+            with stats.timer("help_load"):
+                return self.read_help_info(help_file)
+        except (json.JSONDecodeError, ValueError):
             messagebox.showerror("Error", "Invalid JSON format in help file.")
             return {}
         except FileNotFoundError:
             messagebox.showerror("Error", f"Help file not found: {help_file}")
             return {}
 
-    def display_help(self, element_id, platform):
-        if element_id in self.help_info:
-            help_data = self.help_info[element_id]
+    def entry_hashes(self, help_info):
+        # Only for compiled files and daemon fallbacks; plain .ftxt files are hashed by scan_ftxt_entries
+        if isinstance(help_info, CompiledHelp):
+            return {element_id: help_info.entry_hash(element_id) for element_id in help_info.keys()}
+        return {element_id: content_hash(data) for element_id, data in help_info.items()}
+
+    def reload_help_info(self):
+        # Re-read the help file and swap in only the entries whose content hash changed.
+        # Returns the IDs of changed and removed entries.
+        return self.apply_reload(*self.scan_reload())
+
+    def scan_baseline(self):
+        # Hashes of the entries as loaded, for the first reload of a plain .ftxt file. Runs on a worker thread.
+        help_info = self.help_info
+        if self.daemon or not isinstance(help_info, dict) or not is_plain_ftxt(self.help_file):
+            return None
+        signature = help_file_signature(self.help_file)
+        if signature != self.help_signature:
+            return None  # Changed since it was loaded; the first reload then converts every entry
+        hashes, _ = scan_ftxt_entries(self.help_file, None, convert=False)
+        if help_file_signature(self.help_file) != signature:
+            return None
+        return help_info, hashes
+
+    def scan_reload(self):
+        # Reads and hashes the help file without touching Tk or the current entries, so HelpFileWatcher
+        # can run it on a worker thread. Returns the arguments of apply_reload.
+        old_info = self.help_info
+        old_hashes = self.help_hashes
+        if not self.daemon and isinstance(old_info, dict) and is_plain_ftxt(self.help_file):
+            # Plain .ftxt files are streamed; only the entries whose stored text changed are converted
+            new_hashes, converted = scan_ftxt_entries(self.help_file, old_hashes)
+            new_info = {element_id: converted[element_id] if element_id in converted else old_info[element_id]
+                        for element_id in new_hashes}
+            removed = [element_id for element_id in (old_hashes or old_info) if element_id not in new_hashes]
+            return old_info, new_info, new_hashes, list(converted), removed
+
+        new_info = self.read_help_info(self.help_file)
+        if isinstance(new_info, ShardedHelpInfo) or is_remote(new_info) or type(new_info) is not type(old_info):
+            return old_info, new_info, None, list(new_info.keys()), None
+
+        old_hashes = old_hashes if old_hashes is not None else self.entry_hashes(old_info)
+        new_hashes = self.entry_hashes(new_info)
+        changed = [element_id for element_id, digest in new_hashes.items() if old_hashes.get(element_id) != digest]
+        removed = [element_id for element_id in old_hashes if element_id not in new_hashes]
+        if not isinstance(new_info, CompiledHelp):
+            changed_ids = set(changed)
+            new_info = {element_id: new_info[element_id] if element_id in changed_ids else old_info[element_id]
+                        for element_id in new_info}
+        return old_info, new_info, new_hashes, changed, removed
+
+    def apply_reload(self, old_info, new_info, new_hashes, changed, removed):
+        # The Tk-thread half of a reload: swaps in the new entries and drops what depended on changed ones.
+        # removed is None when the help was swapped whole.
+        if removed is None:
+            # Bundles load shards lazily and daemon clients hold no entries, so they are swapped whole;
+            # entries are read again on demand
+            self.help_info = new_info
+            self.help_hashes = None
+            self.render_plans.clear()
+            self.resolved_ids.clear()
+            self.search_index = None
+            self.id_index = None
+            if self.prefetcher is not None:
+                self.prefetcher.discard()
+            return changed, []
+
+        changed_ids = set(changed)
+        if isinstance(new_info, CompiledHelp):
+            # Keep already decoded entries that did not change; the rest are decoded on demand
+            new_info.decoded = {element_id: data for element_id, data in old_info.decoded.items()
+                                if element_id in new_hashes and element_id not in changed_ids}
+
+        self.help_info = new_info  # A single assignment, so lookups never see a half-updated mapping
+        self.help_hashes = new_hashes
+        if isinstance(old_info, CompiledHelp):
+            old_info.close()
+        if changed or removed:
+            self.resolved_ids.clear()  # Fuzzy matches may resolve differently now
+            if self.prefetcher is not None and self.prefetcher.prepared_id in changed_ids | set(removed):
+                self.prefetcher.discard()
+        for element_id in changed + removed:
+            self.render_plans.pop(element_id, None)
+            if self.id_index is not None:
+                if element_id in changed_ids:
+                    self.id_index.add(element_id, element_id)
+                else:
+                    self.id_index.remove(element_id)
+            if self.search_index is not None:
+                if element_id in changed_ids:
+                    self.search_index.add(element_id, element_id, new_info[element_id])
+                else:
+                    self.search_index.remove(element_id)
+        return changed, removed
+
+    def start_hot_reload(self, interval=1000, on_reload=None):
+        # Opt-in: poll the help file from the Tk event loop and apply edits while the application runs
+        master = self.master or getattr(tkinter, "_default_root", None)
+        if master is None:
+            raise RuntimeError("Hot reload needs a Tk root; pass master= to ContextualHelp.")
+        if self.watcher is None:
+            self.watcher = HelpFileWatcher(self, master, interval, on_reload)
+            self.watcher.start()
+        return self.watcher
 
-            root = Tk()
-            root.withdraw()  # Hide the root window
-            help_window = Toplevel(root)
-            help_window.title(f"Help - {element_id.capitalize()}")
-            text_widget = Text(help_window, wrap="word")
-            text_widget.pack(expand=True, fill="both")
+    def stop_hot_reload(self):
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
 
-            self.apply_formatting(text_widget, help_data)
-            help_window.mainloop()
+    def start_prefetch(self, element_id_for=None):
+        # Opt-in: prepare help for the focused widget during idle time. element_id_for maps a widget to
+        # the ID passed to display_help; by default its Tk name, as the F1 handlers use.
+        master = self.master or getattr(tkinter, "_default_root", None)
+        if master is None:
+            raise RuntimeError("Prefetching needs a Tk root; pass master= to ContextualHelp.")
+        if self.prefetcher is None:
+            self.prefetcher = HelpPrefetcher(self, master, element_id_for)
+            self.prefetcher.start()
+        return self.prefetcher
+
+    def stop_prefetch(self):
+        if self.prefetcher is not None:
+            self.prefetcher.stop()
+            self.prefetcher = None
+
+    def get_search_index(self):
+        if is_remote(self.help_info):
+            return self.help_info  # The daemon keeps the index
+        if self.search_index is None:
+            self.search_index = HelpSearchIndex()
+            for element_id, help_data in self.help_info.items():
+                self.search_index.add(element_id, element_id, help_data)
+        return self.search_index
+
+    def get_id_index(self):
+        if is_remote(self.help_info):
+            return self.help_info  # The daemon resolves IDs
+        if self.id_index is None:
+            self.id_index = HelpIdIndex(self.help_info.keys())
+        return self.id_index
+
+    def search(self, query, limit=20):
+        return self.get_search_index().search(query, limit)
+
+    def resolve_element_id(self, element_id):
+        # Never builds the full-text index; HelpPrefetcher calls this for every focused widget
+        if element_id in self.help_info:
+            return element_id
+        if element_id in self.resolved_ids:
+            return self.resolved_ids.get(element_id)
+        resolved = self.get_id_index().resolve_id(element_id)
+        self.resolved_ids.put(element_id, resolved)
+        return resolved
+
+    def display_help(self, element_id, platform):
+        with stats.timer("lookup"):
+            element_id = self.resolve_element_id(element_id)
+        if element_id is not None:
+            help_window = None
+            if self.prefetcher is not None:
+                help_window = self.prefetcher.take_window(element_id)
+                if help_window is None:
+                    self.prefetcher.discard()  # Free the reserved window rather than recycle a visible one
+            if help_window is None:
+                help_window = self.open_help_window(help_title(element_id))
+                with stats.timer("render"):
+                    render_plan(help_window.text_widget, self.get_render_plan(element_id))
+            self.show_help_window(help_window)
         else:
             messagebox.showinfo("Help", "No help available for this element.")
 
+    def get_render_plan(self, element_id):
+        plan = self.render_plans.get(element_id)
+        if plan is None:
+            plan = compile_render_plan(self.help_info.get(element_id, []))
+            plan.get_insert_chunks()  # Build the Text.insert arguments now rather than on display
+            self.render_plans.put(element_id, plan)
+        return plan
+
     def apply_formatting(self, text_widget, help_data):
-        default_font = font.nametofont(text_widget.cget("font"))
-        current_font_family = default_font.actual()["family"]
-        current_font_size = default_font.actual()["size"]
-
-        for line in help_data:
-            text_widget.insert(END, line["text"] + "\n")
-            line_start = text_widget.index(f"end-2c linestart")
-            line_end = text_widget.index(f"end-1c")
-
-            for tag, _ in line["tags"].items():
-                if tag.startswith("color_"):
-                    text_widget.tag_configure(tag, foreground=tag[6:])
-                elif tag.startswith("family_"):
-                    family = tag[7:]
-                    text_widget.tag_configure(tag, font=(family, current_font_size))
-                elif tag.startswith("size_"):
-                    size = int(tag[5:])
-                    text_widget.tag_configure(tag, font=(current_font_family, size))
-                elif tag == "bold":
-                    text_widget.tag_configure(tag, font=(current_font_family, current_font_size, "bold"))
-                elif tag == "italic":
-                    text_widget.tag_configure(tag, font=(current_font_family, current_font_size, "italic"))
-                elif tag == "underline":
-                    text_widget.tag_configure(tag, underline=True)
-
-                text_widget.tag_add(tag, line_start, line_end)
+        render_plan(text_widget, compile_render_plan(help_data))
 
     def show_general_help(self):
-        root = Tk()
-        root.withdraw()  # Hide the root window
-        help_window = Toplevel(root)
-        help_window.title("General Help")
-        text_widget = Text(help_window, wrap="word")
-        text_widget.pack(expand=True, fill="both")
+        help_window = self.open_help_window("General Help")
+        text_widget = help_window.text_widget
 
         # Display title
-        self.apply_formatting(text_widget, self.help_info.get("title", []))
+        render_plan(text_widget, self.get_render_plan("title"))
         text_widget.insert(END, "\n\n")  # Add some space between title and description
 
         # Display description
-        self.apply_formatting(text_widget, self.help_info.get("description", []))
+        render_plan(text_widget, self.get_render_plan("description"))
 
-        help_window.mainloop()
+        self.show_help_window(help_window)
@@ -0,0 +1,68 @@
+#The ExtractionCache class stores GUI element extraction results on disk.
+#Entries are keyed on the absolute source path, a SHA-256 hash of the file content and the
+#extractor rules fingerprint, so unchanged modules skip parsing completely on the next analysis.
+#Each entry is a small JSON file written atomically, which makes the cache safe to share
+#between the generator window and parallel batch workers.
+
+import hashlib
+import json
+import os
+import tempfile
+
+from guianalyzer import extractor_fingerprint
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "helpfilegenerator", "extraction")
+
+
+class ExtractionCache:
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or os.environ.get("HELPGEN_CACHE_DIR") or DEFAULT_CACHE_DIR
+
+    def entry_key(self, file_path, content):
+        digest = hashlib.sha256()
+        digest.update(os.path.abspath(file_path).encode("utf-8", "surrogateescape"))
+        digest.update(b"\0" + extractor_fingerprint().encode("ascii") + b"\0")
+        digest.update(content)
+        return digest.hexdigest()
+
+    def entry_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + ".json")
+
+    def get(self, file_path, content):
+        try:
+            with open(self.entry_path(self.entry_key(file_path, content)), "r") as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if entry.get("version") != extractor_fingerprint():
+            return None
+        return entry["framework"], dict(entry["elements"])
+
+    def put(self, file_path, content, framework, element_info):
+        path = self.entry_path(self.entry_key(file_path, content))
+        entry = {
+            "version": extractor_fingerprint(),
+            "path": os.path.abspath(file_path),
+            "framework": framework,
+            # Stored as pairs so element order survives the round trip
+            "elements": [[name, element_type] for name, element_type in element_info.items()],
+        }
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "w") as file:
+                json.dump(entry, file)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass  # The cache is an optimization only
+
+    def clear(self):
+        for dirpath, dirnames, filenames in os.walk(self.cache_dir, topdown=False):
+            for filename in filenames:
+                if filename.endswith((".json", ".tmp")):
+                    os.remove(os.path.join(dirpath, filename))
+            if dirpath != self.cache_dir:
+                try:
+                    os.rmdir(dirpath)
+                except OSError:
+                    pass
@@ -0,0 +1,336 @@
+#Reading and writing .ftxt help files.
+#Every help entry is a list of lines. A line is {"text": str, "tags": {tag: true, ...}} where the tags
+#apply to the whole line. Lines with formatting that changes mid-line also carry a "runs" list of
+#{"text", "tags"} pieces; "text" then holds the full line and "tags" the formatting at column 0, so
+#readers that do not know about runs still show the right text.
+#
+#Version 1 files are indented JSON with the tag dict repeated on every line. Version 2 files store each
+#distinct tag set once in a "styles" table and write lines as [text, style] or [text, style, runs]
+#arrays, optionally gzip or lzma compressed. read_ftxt accepts both and always returns the version 1
+#layout, so the rest of the application only ever sees one shape. iter_ftxt_entries reads a file of
+#either version in chunks and yields one entry at a time, for tools that must not hold the whole file.
+#
+#Usage:
+#    python ftxtformat.py convert in.ftxt out.ftxt [--version 2] [--compress gzip|lzma]
+
+import argparse
+import gzip
+import json
+import lzma
+import os
+import sys
+import time
+
+FORMAT_VERSION = 2
+COMPRESSIONS = {"gzip": gzip, "lzma": lzma}
+MAGIC_BYTES = {b"\x1f\x8b": "gzip", b"\xfd7zXZ\x00": "lzma"}
+
+FORMAT_TAG_PREFIXES = ("color_", "family_", "size_", "bold", "italic", "underline")
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def line_runs(line):
+    runs = line.get("runs")
+    if runs:
+        for run in runs:
+            yield run["text"], run["tags"]
+    else:
+        yield line["text"], line["tags"]
+
+
+def make_line(runs):
+    # runs: list of (text, tags dict); adjacent runs with equal tags are merged
+    merged = []
+    for text, tags in runs:
+        if merged and merged[-1][1] == tags:
+            merged[-1][0] += text
+        else:
+            merged.append([text, tags])
+    if not merged:
+        return {"text": "", "tags": {}}
+    line = {"text": "".join(text for text, _ in merged), "tags": merged[0][1]}
+    if len(merged) > 1:
+        line["runs"] = [{"text": text, "tags": tags} for text, tags in merged]
+    return line
+
+
+def detect_compression(path):
+    with open(path, "rb") as file:
+        head = file.read(6)
+    for magic, compression in MAGIC_BYTES.items():
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def open_ftxt(path, compression=None):
+    # Opens a possibly compressed .ftxt file for reading as text
+    compression = compression or detect_compression(path)
+    if compression:
+        return COMPRESSIONS[compression].open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def file_format(content):
+    # Returns the format version of already decoded JSON content
+    if isinstance(content, dict) and content.get("format") == "ftxt":
+        return content.get("version", 1)
+    return 1
+
+
+def load_ftxt(path):
+    # Returns (content in the version 1 layout, format version, compression)
+    compression = detect_compression(path)
+    try:
+        with open_ftxt(path, compression) as file:
+            content = json.load(file)
+    except (EOFError, lzma.LZMAError, gzip.BadGzipFile) as e:
+        raise ValueError(f"Corrupt compressed help file {path}: {e}") from e
+    version = file_format(content)
+    if version == 2:
+        content = decode_v2(content)
+    return content, version, compression
+
+
+def read_ftxt(path):
+    return load_ftxt(path)[0]
+
+
+def write_ftxt(path, content, version=1, compression=None):
+    if version == 2:
+        data = json.dumps(encode_v2(content), separators=(",", ":"), ensure_ascii=False)
+    else:
+        data = json.dumps(content, indent=2)
+    write_ftxt_text(path, data, compression)
+
+
+def write_ftxt_text(path, data, compression=None):
+    # Writes already serialized .ftxt text
+    if compression:
+        with COMPRESSIONS[compression].open(path, "wt", encoding="utf-8") as file:
+            file.write(data)
+    else:
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(data)
+
+
+class StyleTable:
+    def __init__(self, styles=None):
+        self.styles = [list(style) for style in styles] if styles else [[]]  # Style 0 is always "no tags"
+        self.ids = {}  # Sorted tags -> style ID, so the same tags in another order share a style
+        for i, style in enumerate(self.styles):
+            self.ids.setdefault(tuple(sorted(style)), i)
+        self.decoded = [dict.fromkeys(style, True) for style in self.styles]
+
+    def style_id(self, tags):
+        key = tuple(sorted(tags))
+        style_id = self.ids.get(key)
+        if style_id is None:
+            style_id = self.ids[key] = len(self.styles)
+            self.styles.append(list(tags))  # Written in the order first seen
+        return style_id
+
+    def tags(self, style_id):
+        # Lines decoded from one file share the tag dict of each style; treat it as read-only
+        return self.decoded[style_id]
+
+
+def encode_lines(lines, table):
+    if not isinstance(lines, list):
+        return lines  # Unedited entries are stored as plain strings
+    encoded = []
+    for line in lines:
+        item = [line["text"], table.style_id(line["tags"])]
+        if line.get("runs"):
+            item.append([[run["text"], table.style_id(run["tags"])] for run in line["runs"]])
+        encoded.append(item)
+    return encoded
+
+
+def decode_lines(lines, table):
+    if not isinstance(lines, list):
+        return lines
+    styles = table.decoded
+    decoded = []
+    for item in lines:
+        line = {"text": item[0], "tags": styles[item[1]]}
+        if len(item) > 2:
+            line["runs"] = [{"text": text, "tags": styles[style_id]} for text, style_id in item[2]]
+        decoded.append(line)
+    return decoded
+
+
+def encode_v2(content):
+    table = StyleTable()
+    general = content.get("General", {})
+    elements = content.get("MainWindow", {}).get("elements", {})
+    encoded_general = {key: encode_lines(value, table) for key, value in general.items()}
+    encoded_elements = {name: encode_lines(value, table) for name, value in elements.items()}
+    # The style table comes before the entries so streaming readers can decode entries as they go
+    return {
+        "format": "ftxt",
+        "version": FORMAT_VERSION,
+        "styles": table.styles,
+        "General": encoded_general,
+        "MainWindow": {"elements": encoded_elements}
+    }
+
+
+def decode_v2(content):
+    table = StyleTable(content.get("styles"))
+    return {
+        "General": {key: decode_lines(value, table) for key, value in content.get("General", {}).items()},
+        "MainWindow": {
+            "elements": {name: decode_lines(value, table)
+                         for name, value in content.get("MainWindow", {}).get("elements", {}).items()}
+        }
+    }
+
+
+def used_style_ids(lines):
+    # Sorted style IDs that version 2 encoded lines refer to
+    style_ids = set()
+    for item in lines:
+        style_ids.add(item[1])
+        if len(item) > 2:
+            style_ids.update(style_id for _, style_id in item[2])
+    return sorted(style_ids)
+
+
+class JsonStream:
+    # Walks a JSON document in a text file, reading it in chunks; values are decoded one at a time
+    def __init__(self, file, chunk_size=STREAM_CHUNK_SIZE):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk  # Drop what has been consumed
+        self.pos = 0
+        return True
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                raise ValueError("Unexpected end of help file")
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} in help file, found {self.buffer[self.pos]!r}")
+        self.pos += 1
+
+    def value(self, with_text=False):
+        # With with_text, returns (value, its JSON text exactly as stored)
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue  # The value runs past the end of the buffer
+                raise
+            if end == len(self.buffer) and self.fill():
+                continue  # A number or literal may have been cut off by the chunk boundary
+            start, self.pos = self.pos, end
+            if with_text:
+                return value, self.buffer[start:end]
+            return value
+
+    def members(self):
+        # Yields the keys of the object at the current position; the caller must read each value
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            separator = self.peek()
+            self.pos += 1
+            if separator == "}":
+                return
+            if separator != ",":
+                raise ValueError(f"Expected ',' or '}}' in help file, found {separator!r}")
+
+
+def iter_ftxt_entries(path, with_text=False):
+    # Yields (section, key, lines) in the version 1 layout, one entry at a time: first the "General"
+    # title and description, then ("MainWindow", element ID, lines) for every element.
+    # With with_text, (section, key, lines, text) where text is the entry as stored; in version 2 files
+    # the styles it uses come first, so equal text always means equal content.
+    with open_ftxt(path) as file:
+        stream = JsonStream(file)
+        table = None
+
+        def entry(section, name):
+            value, text = stream.value(True) if with_text else (stream.value(), None)
+            if table is None:
+                if isinstance(value, list) and value and isinstance(value[0], list):
+                    raise ValueError(f"Style table missing before the entries of {path}")
+            elif isinstance(value, list):
+                if with_text:
+                    styles = [[style_id, table.styles[style_id]] for style_id in used_style_ids(value)]
+                    text = json.dumps(styles, separators=(",", ":"), ensure_ascii=False) + "\n" + text
+                value = decode_lines(value, table)
+            if with_text:
+                return section, name, value, text
+            return section, name, value
+
+        for key in stream.members():
+            if key == "styles":
+                table = StyleTable(stream.value())
+            elif key == "General":
+                for name in stream.members():
+                    yield entry("General", name)
+            elif key == "MainWindow":
+                for window_key in stream.members():
+                    if window_key != "elements":
+                        stream.value()
+                        continue
+                    for element in stream.members():
+                        yield entry("MainWindow", element)
+            else:
+                stream.value()  # "format", "version" and anything unknown
+
+
+def convert(in_path, out_path, version=FORMAT_VERSION, compression=None):
+    start = time.perf_counter()
+    content = read_ftxt(in_path)
+    read_time = time.perf_counter() - start
+    write_ftxt(out_path, content, version, compression)
+    start = time.perf_counter()
+    read_ftxt(out_path)
+    reread_time = time.perf_counter() - start
+    return os.path.getsize(in_path), read_time, os.path.getsize(out_path), reread_time
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert .ftxt help files between format versions.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    convert_parser = subparsers.add_parser("convert", help="convert a help file and report size and load time")
+    convert_parser.add_argument("input")
+    convert_parser.add_argument("output")
+    convert_parser.add_argument("--version", type=int, choices=[1, 2], default=FORMAT_VERSION)
+    convert_parser.add_argument("--compress", choices=sorted(COMPRESSIONS), default=None)
+    args = parser.parse_args(argv)
+
+    in_size, read_time, out_size, reread_time = convert(args.input, args.output, args.version, args.compress)
+    print(f"{args.input}: {in_size} bytes, loaded in {read_time * 1000:.1f} ms")
+    print(f"{args.output}: {out_size} bytes ({out_size / max(in_size, 1):.1%}), loaded in {reread_time * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,330 @@
+#The GuiAnalyzer class extracts GUI elements from Python source code without needing Tk.
+#It is shared by the HelpFileGenerator window and the headless batch analyzer.
+#detect_gui_framework looks at the imports to decide which framework the module uses; the first GUI
+#import in the file decides, wherever it is nested. prescan_gui_framework reaches the same answer from
+#the token stream without building a syntax tree, so non-GUI modules can be skipped before parsing.
+#extract_gui_elements walks the syntax tree and collects named widgets for the help file.
+#Each supported framework is described by a FrameworkRules entry; new frameworks and widget types
+#can be added with register_framework and register_widget_types. Worker processes start with only the
+#built-in rules, so callers pass registered_rules() along and the worker calls load_rules.
+
+import ast
+import hashlib
+import io
+import re
+import tokenize
+
+# Bump whenever extraction logic changes so cached results are invalidated
+EXTRACTOR_VERSION = "3"
+
+COMMON_WIDGET_TYPES = ['Button', 'Label', 'Entry', 'Text', 'Listbox', 'Combobox', 'InputText', 'Combo', 'Multiline']
+
+
+class FrameworkRules:
+    def __init__(self, name, modules, widget_types, name_keywords=(), assign_names=False):
+        self.name = name
+        self.modules = tuple(modules)  # Top-level package names that identify the framework
+        self.widget_types = set(widget_types)  # Constructor names treated as GUI elements
+        self.name_keywords = frozenset(name_keywords)  # Keyword arguments holding the element name
+        self.assign_names = assign_names  # Use the assigned variable name (e.g. PyQt widgets)
+
+
+FRAMEWORK_RULES = {}
+MODULE_FRAMEWORKS = {}
+_fingerprint = None
+_module_pattern = None
+
+
+def register_framework(rules):
+    global _fingerprint, _module_pattern
+    FRAMEWORK_RULES[rules.name] = rules
+    for module in rules.modules:
+        MODULE_FRAMEWORKS[module] = rules.name
+    _fingerprint = None
+    _module_pattern = None
+    return rules
+
+
+def register_widget_types(framework, *widget_types):
+    global _fingerprint
+    FRAMEWORK_RULES[framework].widget_types.update(widget_types)
+    _fingerprint = None
+
+
+def registered_rules():
+    # Snapshot of the registered rules to pass to spawned worker processes, which only see the defaults
+    return list(FRAMEWORK_RULES.values())
+
+
+def load_rules(rules_list):
+    # Re-registers a registered_rules snapshot inside a worker process
+    for rules in rules_list:
+        register_framework(rules)
+
+
+def framework_for_module(module_name):
+    return MODULE_FRAMEWORKS.get(module_name.split(".", 1)[0])
+
+
+def framework_for_imports(modules):
+    for module in modules:
+        framework = framework_for_module(module)
+        if framework:
+            return framework
+    return None
+
+
+def import_modules(node):
+    # Module names an Import or ImportFrom node can bring in; "from six.moves import tkinter" counts too
+    modules = [alias.name for alias in node.names]
+    if isinstance(node, ast.ImportFrom) and node.module:
+        modules.append(node.module)
+    return modules
+
+
+def module_pattern():
+    global _module_pattern
+    if _module_pattern is None:
+        names = sorted(MODULE_FRAMEWORKS, key=len, reverse=True)
+        _module_pattern = re.compile(rb"\b(?:" + b"|".join(re.escape(name.encode("ascii")) for name in names) + rb")\b")
+    return _module_pattern
+
+
+def prescan_gui_framework(content):
+    # Finds the first GUI framework import in the source bytes without parsing them.
+    # Files that never mention a framework module are rejected by one regex search; otherwise the
+    # tokenizer runs only as far as needed, so strings and comments cannot cause false matches.
+    matches = list(module_pattern().finditer(content))
+    if not matches:
+        return None
+    last_line = content.count(b"\n", 0, matches[-1].start()) + 1
+    tokens = (token for token in tokenize.tokenize(io.BytesIO(content).readline)
+              if token.type != tokenize.COMMENT and token.type != tokenize.NL)
+    try:
+        for token in tokens:
+            if token.start[0] > last_line:
+                break  # No framework module is mentioned past this point
+            if token.type == tokenize.NAME and (token.string == "import" or token.string == "from"):
+                framework = framework_for_imports(scan_import(token.string, tokens))
+                if framework:
+                    return framework
+    except (tokenize.TokenError, IndentationError) as e:
+        raise SyntaxError(str(e)) from e
+    return None
+
+
+def scan_import(keyword, tokens):
+    # Reads one import statement from the token stream, starting after "import" or "from", and returns
+    # its module names in the order import_modules uses. "yield from" and "raise ... from" give [].
+    module = None
+    if keyword == "from":
+        parts = []
+        for token in tokens:
+            if token.type == tokenize.NAME and token.string == "import":
+                break
+            if token.type != tokenize.NAME and token.string not in (".", "..."):
+                return []
+            parts.append(token.string)
+        module = "".join(parts).lstrip(".")
+    names = []
+    expect_name = True
+    for token in tokens:
+        if token.type == tokenize.NAME and expect_name:
+            names.append(token.string)
+            expect_name = False
+        elif token.string == "." and names:
+            names[-1] += "." + next(tokens, token).string
+        elif token.string == "as":
+            next(tokens, None)  # The alias is not a module name
+        elif token.string == ",":
+            expect_name = True
+        elif token.string not in ("(", ")", "*"):
+            break  # NEWLINE, ";" or the end of the file
+    if module:
+        names.append(module)
+    return names
+
+
+def extractor_fingerprint():
+    # Identifies the extractor version plus the registered rules, for cache keys
+    global _fingerprint
+    if _fingerprint is None:
+        parts = [EXTRACTOR_VERSION]
+        for name in sorted(FRAMEWORK_RULES):
+            rules = FRAMEWORK_RULES[name]
+            parts.append(f"{name}:{','.join(rules.modules)}:{','.join(sorted(rules.widget_types))}:"
+                         f"{','.join(sorted(rules.name_keywords))}:{int(rules.assign_names)}")
+        _fingerprint = hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()[:16]
+    return _fingerprint
+
+
+def callee_name(func):
+    if type(func) is ast.Attribute:
+        return func.attr
+    if type(func) is ast.Name:
+        return func.id
+    return None
+
+
+def target_name(target):
+    if type(target) is ast.Name:
+        return target.id
+    if type(target) is ast.Attribute:
+        return target.attr  # self.button = QPushButton(...)
+    return None
+
+
+register_framework(FrameworkRules(
+    "Tkinter", ["tkinter", "Tkinter"],
+    COMMON_WIDGET_TYPES + ['Checkbutton', 'Radiobutton', 'Spinbox', 'Scale', 'Treeview', 'Canvas', 'Message',
+                           'Menubutton', 'Notebook', 'Progressbar'],
+    name_keywords=["name"]))
+register_framework(FrameworkRules(
+    "PySimpleGUI", ["PySimpleGUI"],
+    COMMON_WIDGET_TYPES + ['Input', 'Checkbox', 'Radio', 'Slider', 'Spin', 'OptionMenu', 'Output', 'Table',
+                           'Tree', 'Image', 'Graph'],
+    name_keywords=["key", "k"]))
+register_framework(FrameworkRules(
+    "PyQt", ["PyQt4", "PyQt5", "PyQt6"],
+    ['QPushButton', 'QLabel', 'QLineEdit', 'QTextEdit', 'QPlainTextEdit', 'QListWidget', 'QListView',
+     'QComboBox', 'QCheckBox', 'QRadioButton', 'QSpinBox', 'QDoubleSpinBox', 'QSlider', 'QTableWidget',
+     'QTableView', 'QTreeWidget', 'QTreeView', 'QTabWidget', 'QGroupBox', 'QDateEdit', 'QProgressBar',
+     'QToolButton'],
+    assign_names=True))
+
+
+class GuiAnalyzer:
+    def __init__(self):
+        self.gui_framework = None  # Will hold detected framework name
+        self.elements = {}  # Element name -> help content
+        self.element_info = {}  # Store element name and type information
+
+    def analyze_file(self, file_path, cache=None):
+        with open(file_path, "rb") as file:
+            content = file.read()
+
+        if cache is not None:
+            cached = cache.get(file_path, content)
+            if cached is not None:
+                self.gui_framework, element_info = cached
+                for name, element_type in element_info.items():
+                    self.add_element(name, element_type)
+                return self.gui_framework
+
+        self.analyze_source(content, file_path)
+        if cache is not None:
+            cache.put(file_path, content, self.gui_framework, self.element_info)
+        return self.gui_framework
+
+    def analyze_source(self, content, filename="<unknown>"):
+        self.gui_framework = None
+        if isinstance(content, bytes) and prescan_gui_framework(content) is None:
+            return None  # Not GUI code; skip the full parse
+        tree = ast.parse(content, filename)
+        self.detect_gui_framework(tree)
+        if self.gui_framework:
+            self.extract_gui_elements(tree)
+        return self.gui_framework
+
+    def detect_gui_framework(self, tree):
+        # The first GUI import in source order decides, including imports inside functions, classes,
+        # try/except and if blocks
+        self.gui_framework = None
+        imports = [node for node in ast.walk(tree) if type(node) is ast.Import or type(node) is ast.ImportFrom]
+        imports.sort(key=lambda node: (node.lineno, node.col_offset))
+        for node in imports:
+            framework = framework_for_imports(import_modules(node))
+            if framework:
+                self.gui_framework = framework
+                break
+        return self.gui_framework
+
+    def extract_gui_elements(self, node):
+        for batch, lineno in self.iter_gui_elements(node):
+            pass
+
+    def iter_gui_elements(self, node, batch_size=500, progress_interval=20000):
+        # Single pre-order pass with an explicit stack, so deeply nested layouts cannot hit RecursionError.
+        # Yields (new elements, current line number) every batch_size elements or progress_interval nodes,
+        # so callers can stream results and report progress.
+        rules = FRAMEWORK_RULES.get(self.gui_framework)
+        if rules is None:
+            return
+        widget_types = rules.widget_types
+        assign_names = rules.assign_names
+        Call = ast.Call
+        Assign = ast.Assign
+        iter_child_nodes = ast.iter_child_nodes
+
+        batch = []
+        visited = 0
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            node_type = type(node)
+            element_name = None
+            if node_type is Call:
+                element_type = callee_name(node.func)
+                if element_type in widget_types and node.keywords:
+                    element_name = self.get_element_name(node)
+            elif node_type is Assign and assign_names and type(node.value) is Call:
+                element_type = callee_name(node.value.func)  # Widget type (e.g., QPushButton)
+                if element_type in widget_types:
+                    element_name = target_name(node.targets[0])  # Variable name
+            if element_name is not None:
+                element_name = self.add_element(element_name, element_type)
+                if element_name is not None:
+                    batch.append((element_name, element_type))
+
+            children = list(iter_child_nodes(node))
+            children.reverse()
+            stack.extend(children)
+
+            visited += 1
+            if len(batch) >= batch_size or visited % progress_interval == 0:
+                yield batch, getattr(node, "lineno", 0)
+                batch = []
+        yield batch, None
+
+    def get_element_name(self, node):
+        rules = FRAMEWORK_RULES.get(self.gui_framework)
+        if rules is None:
+            return None
+        for kw in node.keywords:
+            if kw.arg in rules.name_keywords:
+                value = kw.value
+                if isinstance(value, ast.Constant) and isinstance(value.value, str):
+                    return value.value
+        return None
+
+    def is_gui_element(self, element_type):
+        rules = FRAMEWORK_RULES.get(self.gui_framework)
+        return rules is not None and element_type in rules.widget_types
+
+    def add_element(self, element_name, element_type):
+        base_name = element_name
+        counter = 1
+        original_name = element_name
+
+        # Ensure unique names
+        while element_name in self.elements:
+            element_name = f"{base_name}_{counter}"
+            counter += 1
+
+        if original_name not in self.element_info:
+            self.elements[element_name] = ""
+            self.element_info[element_name] = element_type
+            return element_name
+        return None
+
+
+def skeleton_help_content(elements):
+    return {
+        "General": {
+            "title": [],
+            "description": []
+        },
+        "MainWindow": {
+            "elements": {name: "" for name in elements}
+        }
+    }
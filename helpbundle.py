@@ -0,0 +1,155 @@
+#Sharded help bundles for large multi-window applications.
+#A bundle is a directory holding manifest.json and one .ftxt shard per window or module. The manifest
+#carries the General section and maps every element ID to its shard, so ShardedHelpInfo can answer
+#lookups without reading any shard. A shard is loaded the first time one of its elements is requested,
+#and the least recently used shards are evicted once the loaded shards exceed a memory cap.
+#
+#Usage:
+#    python helpbundle.py build help_bundle/ help/*.ftxt [--compress gzip]
+
+import argparse
+import json
+import os
+import sys
+from collections import OrderedDict
+
+from ftxtformat import COMPRESSIONS, read_ftxt, write_ftxt
+from helpindex import restructure_help_content
+from helpmodel import entries_from_ftxt
+
+MANIFEST_NAME = "manifest.json"
+BUNDLE_FORMAT = "ftxt-bundle"
+DEFAULT_MEMORY_CAP = 16 * 1024 * 1024  # Bytes of shard JSON kept loaded at once
+
+
+def is_bundle(path):
+    return os.path.isdir(path) or os.path.basename(path) == MANIFEST_NAME
+
+
+def manifest_path(path):
+    return os.path.join(path, MANIFEST_NAME) if os.path.isdir(path) else path
+
+
+def shard_name(help_file, used_names):
+    base = os.path.splitext(os.path.basename(help_file))[0]
+    name, counter = base, 1
+    while name in used_names:
+        name = f"{base}_{counter}"
+        counter += 1
+    return name
+
+
+def build_bundle(help_files, out_dir, version=2, compression=None):
+    shard_dir = os.path.join(out_dir, "shards")
+    os.makedirs(shard_dir, exist_ok=True)
+    general = {"title": [], "description": []}
+    shards = {}
+    element_shards = {}
+    for help_file in help_files:
+        content = read_ftxt(help_file)
+        file_general = content.get("General", {})
+        if not general["title"] and file_general.get("title"):
+            general = {"title": file_general.get("title", []), "description": file_general.get("description", [])}
+
+        name = shard_name(help_file, shards)
+        elements = content.get("MainWindow", {}).get("elements", {})
+        shard_content = {"General": {"title": [], "description": []}, "MainWindow": {"elements": elements}}
+        shard_file = os.path.join("shards", name + ".ftxt")
+        write_ftxt(os.path.join(out_dir, shard_file), shard_content, version, compression)
+        shards[name] = {
+            "file": shard_file,
+            "size": len(json.dumps(elements, separators=(",", ":"))),
+            "source": os.path.basename(help_file)
+        }
+        for element in elements:
+            element_shards.setdefault(element, name)  # The first shard defining an element wins
+
+    manifest = {
+        "format": BUNDLE_FORMAT,
+        "version": 1,
+        "General": general,
+        "shards": shards,
+        "elements": element_shards
+    }
+    with open(os.path.join(out_dir, MANIFEST_NAME), "w") as file:
+        json.dump(manifest, file, separators=(",", ":"))
+    return os.path.join(out_dir, MANIFEST_NAME)
+
+
+class ShardedHelpInfo:
+    def __init__(self, path, memory_cap=DEFAULT_MEMORY_CAP):
+        self.manifest_file = manifest_path(path)
+        self.bundle_dir = os.path.dirname(self.manifest_file)
+        with open(self.manifest_file, "r") as file:
+            manifest = json.load(file)
+        if manifest.get("format") != BUNDLE_FORMAT:
+            raise ValueError(f"Not a help bundle manifest: {self.manifest_file}")
+        self.general = entries_from_ftxt(restructure_help_content({"General": manifest.get("General", {})}))
+        self.shards = manifest["shards"]
+        self.element_shards = manifest["elements"]
+        self.memory_cap = memory_cap
+        self.loaded = OrderedDict()  # Shard name -> {element ID: lines}, least recently used first
+        self.loaded_size = 0
+
+    def load_shard(self, name):
+        shard = self.loaded.get(name)
+        if shard is not None:
+            self.loaded.move_to_end(name)
+            return shard
+        content = read_ftxt(os.path.join(self.bundle_dir, self.shards[name]["file"]))
+        shard = entries_from_ftxt(restructure_help_content({"MainWindow": content.get("MainWindow", {})}))
+        self.loaded[name] = shard
+        self.loaded_size += self.shards[name]["size"]
+        # Evict least recently used shards, but always keep the one just loaded
+        while self.loaded_size > self.memory_cap and len(self.loaded) > 1:
+            evicted, _ = self.loaded.popitem(last=False)
+            self.loaded_size -= self.shards[evicted]["size"]
+        return shard
+
+    def __contains__(self, element_id):
+        return element_id in self.general or element_id in self.element_shards
+
+    def __getitem__(self, element_id):
+        if element_id in self.general:
+            return self.general[element_id]
+        return self.load_shard(self.element_shards[element_id])[element_id]
+
+    def __iter__(self):
+        yield from self.general
+        for element_id in self.element_shards:
+            if element_id not in self.general:
+                yield element_id
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def get(self, element_id, default=None):
+        if element_id in self:
+            return self[element_id]
+        return default
+
+    def keys(self):
+        return list(self)
+
+    def items(self):
+        for element_id in self:
+            yield element_id, self[element_id]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build sharded help bundles from .ftxt files.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser = subparsers.add_parser("build", help="build a bundle with one shard per .ftxt file")
+    build_parser.add_argument("out_dir")
+    build_parser.add_argument("help_files", nargs="+")
+    build_parser.add_argument("--version", type=int, choices=[1, 2], default=2)
+    build_parser.add_argument("--compress", choices=sorted(COMPRESSIONS), default=None)
+    args = parser.parse_args(argv)
+
+    path = build_bundle(args.help_files, args.out_dir, args.version, args.compress)
+    print(f"Wrote {path} with {len(args.help_files)} shards")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,401 @@
+#Shared local help service.
+#On machines running many instances of the same application, each ContextualHelp would otherwise parse
+#and hold its own copy of the help data. The daemon loads each help file, compiled file or bundle once and
+#answers lookups and searches over a Unix domain socket. Messages are compact JSON arrays behind a 4-byte
+#length prefix: requests are [op, help file, args...] and responses [status, value]. Entries travel in
+#the .ftxt version 2 encoding, with the styles they use.
+#ContextualHelp(..., daemon=True), or HELPGEN_DAEMON_SOCKET in the environment, switches it to client mode.
+#RemoteHelpInfo then stands in for the loaded entries, sharing one connection per socket in the process.
+#If the daemon is not running, does not serve the file, or goes away later, the help file is loaded
+#in-process instead.
+#
+#Usage:
+#    python helpdaemon.py help_bundle/ app.ftxt [--socket PATH] [--shared]
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import struct
+import sys
+import tempfile
+import threading
+import time
+
+from ftxtformat import StyleTable, decode_lines, encode_lines
+from helpindex import CompiledHelp
+from helploader import DAEMON_SOCKET_ENV, help_file_signature, read_help_info, source_key
+from helpmodel import lines_from_ftxt, lines_to_ftxt
+from helpsearch import HelpIdIndex, HelpSearchIndex
+from helpstats import stats
+
+HEADER = struct.Struct("!I")
+MAX_MESSAGE_SIZE = 64 * 1024 * 1024
+CHECK_INTERVAL = 1.0  # Seconds between checks of a served file for changes
+CLIENT_TIMEOUT = 2.0
+
+_clients = {}  # Socket path -> HelpClient, shared by every ContextualHelp in the process
+_clients_lock = threading.Lock()
+
+
+def default_socket_path():
+    name = f"helpgen-{os.getuid()}.sock" if hasattr(os, "getuid") else "helpgen.sock"
+    return os.path.join(os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir(), name)
+
+
+def encode_entry(lines):
+    table = StyleTable()
+    encoded = encode_lines(lines_to_ftxt(lines), table)
+    return [table.styles, encoded]
+
+
+def decode_entry(value):
+    styles, encoded = value
+    return lines_from_ftxt(decode_lines(encoded, StyleTable(styles)))
+
+
+def send_message(sock, value):
+    data = json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    sock.sendall(HEADER.pack(len(data)) + data)
+
+
+def recv_exact(sock, size):
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1024 * 1024))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def recv_message(sock):
+    # Returns None when the other side has closed the connection
+    header = recv_exact(sock, HEADER.size)
+    if header is None:
+        return None
+    size = HEADER.unpack(header)[0]
+    if size > MAX_MESSAGE_SIZE:
+        raise ValueError(f"Help daemon message too large: {size} bytes")
+    data = recv_exact(sock, size)
+    if data is None:
+        return None
+    return json.loads(data.decode("utf-8"))
+
+
+class HelpSource:
+    # One served help file. Requests from different connections are serialized by the lock, since
+    # compiled files and bundles decode and cache entries as they are read.
+    def __init__(self, help_file):
+        self.help_file = help_file
+        self.lock = threading.Lock()
+        self.help_info = None
+        self.signature = None
+        self.checked = 0.0
+        self.search_index = None
+        self.id_index = None
+        self.load()
+
+    def load(self):
+        signature = help_file_signature(self.help_file)
+        old_info = self.help_info
+        self.help_info = read_help_info(self.help_file)
+        self.signature = signature
+        self.search_index = None
+        self.id_index = None
+        if isinstance(old_info, CompiledHelp):
+            old_info.close()
+
+    def refresh(self, force=False):
+        now = time.monotonic()
+        if not force and now - self.checked < CHECK_INTERVAL:
+            return
+        self.checked = now
+        if help_file_signature(self.help_file) != self.signature:
+            try:
+                self.load()
+            except (OSError, ValueError):
+                pass  # Probably caught mid-write; keep serving the old content
+
+    def get_search_index(self):
+        if self.search_index is None:
+            self.search_index = HelpSearchIndex()
+            for element_id, help_data in self.help_info.items():
+                self.search_index.add(element_id, element_id, help_data)
+        return self.search_index
+
+    def get_id_index(self):
+        # Resolving only needs the element names, not the entries the search index decodes
+        if self.id_index is None:
+            self.id_index = HelpIdIndex(self.help_info.keys())
+        return self.id_index
+
+    def handle(self, op, args):
+        with self.lock:
+            self.refresh(force=op == "open")
+            if op == "open":
+                return "ok", list(self.help_info.keys())
+            if op == "get":
+                lines = self.help_info.get(args[0])
+                if lines is None:
+                    return "missing", None
+                return "ok", encode_entry(lines)
+            if op == "search":
+                return "ok", self.get_search_index().search(*args)
+            if op == "resolve":
+                return "ok", self.get_id_index().resolve_id(*args)
+        return "error", f"Unknown request {op!r}"
+
+
+class HelpRequestHandler(socketserver.BaseRequestHandler):
+    def setup(self):
+        self.server.connections.add(self.request)
+
+    def finish(self):
+        self.server.connections.discard(self.request)
+
+    def handle(self):
+        # One connection carries any number of requests, so clients connect once and reuse it
+        while True:
+            try:
+                message = recv_message(self.request)
+            except (OSError, ValueError):
+                return
+            if message is None:
+                return
+            send_message(self.request, self.server.daemon.dispatch(message))
+
+
+if hasattr(socket, "AF_UNIX"):
+    class HelpServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+        def __init__(self, socket_path, handler):
+            super().__init__(socket_path, handler)
+            self.connections = set()  # Open client connections, closed with the server
+else:
+    HelpServer = None  # No Unix domain sockets on this platform; clients fall back to in-process loading
+
+
+class HelpDaemon:
+    def __init__(self, help_files, socket_path=None, shared=False):
+        self.socket_path = socket_path or default_socket_path()
+        self.shared = shared  # Let every local user connect, not just the daemon's owner
+        self.sources = {}  # source_key -> HelpSource
+        for help_file in help_files:
+            self.sources[source_key(help_file)] = HelpSource(help_file)
+        self.server = None
+
+    def dispatch(self, message):
+        try:
+            op, help_file, *args = message
+            source = self.sources.get(help_file)
+            if source is None:
+                return ["unknown", None]  # The client loads the file itself
+            status, value = source.handle(op, args)
+        except Exception as e:  # A bad request must not take down the connection thread
+            return ["error", f"{type(e).__name__}: {e}"]
+        return [status, value]
+
+    def bind(self):
+        if os.path.exists(self.socket_path):
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                    probe.connect(self.socket_path)
+            except OSError:
+                os.unlink(self.socket_path)  # Left behind by a daemon that did not shut down cleanly
+            else:
+                raise RuntimeError(f"A help daemon is already listening on {self.socket_path}")
+        if HelpServer is None:
+            raise RuntimeError("The help daemon needs Unix domain sockets, which this platform does not have")
+        self.server = HelpServer(self.socket_path, HelpRequestHandler)
+        self.server.daemon = self
+        os.chmod(self.socket_path, 0o666 if self.shared else 0o600)
+
+    def serve_forever(self):
+        if self.server is None:
+            self.bind()
+        try:
+            self.server.serve_forever()
+        finally:
+            self.close()
+
+    def shutdown(self):
+        # For a daemon running serve_forever in another thread
+        if self.server is not None:
+            self.server.shutdown()
+
+    def close(self):
+        if self.server is not None:
+            for connection in list(self.server.connections):
+                try:
+                    connection.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+            self.server.server_close()
+            self.server = None
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+
+
+class HelpClient:
+    # One connection to the daemon, reused for every request and reopened once if it has dropped
+    def __init__(self, socket_path, timeout=CLIENT_TIMEOUT):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.sock = None
+        self.lock = threading.Lock()
+
+    def connect(self):
+        if not hasattr(socket, "AF_UNIX"):
+            raise ConnectionError("Unix domain sockets are not available on this platform")
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+
+    def request(self, *message):
+        # Returns (status, value); raises OSError if the daemon cannot be reached
+        with self.lock, stats.timer("daemon_request"):
+            for attempt in range(2):
+                try:
+                    if self.sock is None:
+                        self.connect()
+                    send_message(self.sock, message)
+                    response = recv_message(self.sock)
+                    if response is None:
+                        raise ConnectionError("Help daemon closed the connection")
+                    return response[0], response[1]
+                except OSError:
+                    self.close()
+                    if attempt:
+                        raise
+                except ValueError as e:
+                    self.close()
+                    raise ConnectionError(f"Bad response from help daemon: {e}") from e
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+
+def get_client(socket_path):
+    with _clients_lock:
+        client = _clients.get(socket_path)
+        if client is None:
+            client = _clients[socket_path] = HelpClient(socket_path)
+        return client
+
+
+class RemoteHelpInfo:
+    # Element ID -> lines mapping answered by the daemon, used by ContextualHelp in client mode.
+    # Also provides search and resolve_id, so it serves as its own search index.
+    def __init__(self, help_file, client):
+        self.help_file = help_file
+        self.key = source_key(help_file)
+        self.client = client
+        self.local = None  # In-process copy, once the daemon has been lost
+        self.local_index = None
+        self.local_id_index = None
+        status, value = client.request("open", self.key)
+        if status != "ok":
+            raise LookupError(f"Help daemon does not serve {help_file}")
+        self.ids = dict.fromkeys(value)
+
+    def request(self, op, *args):
+        # Returns (status, value), or None once requests are answered by the in-process copy
+        if self.local is None:
+            try:
+                status, value = self.client.request(op, self.key, *args)
+            except OSError:
+                status, value = "unknown", None
+            if status == "ok" or status == "missing":
+                return status, value
+            if status == "error":
+                raise ValueError(f"Help daemon error: {value}")
+            self.local = read_help_info(self.help_file)  # Daemon gone or restarted without this file
+        return None
+
+    def __contains__(self, element_id):
+        if self.local is not None:
+            return element_id in self.local
+        return element_id in self.ids
+
+    def __getitem__(self, element_id):
+        response = self.request("get", element_id)
+        if response is None:
+            return self.local[element_id]
+        status, value = response
+        if status == "missing":
+            raise KeyError(element_id)
+        return decode_entry(value)
+
+    def __iter__(self):
+        return iter(self.local.keys() if self.local is not None else self.ids)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def get(self, element_id, default=None):
+        try:
+            return self[element_id]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return list(self)
+
+    def items(self):
+        for element_id in self:
+            yield element_id, self[element_id]
+
+    def get_local_index(self):
+        if self.local_index is None:
+            self.local_index = HelpSearchIndex()
+            for element_id, help_data in self.local.items():
+                self.local_index.add(element_id, element_id, help_data)
+        return self.local_index
+
+    def search(self, query, limit=20):
+        response = self.request("search", query, limit)
+        if response is None:
+            return self.get_local_index().search(query, limit)
+        return [tuple(result) for result in response[1]]
+
+    def resolve_id(self, element_id, cutoff=0.5):
+        response = self.request("resolve", element_id, cutoff)
+        if response is None:
+            if self.local_id_index is None:
+                self.local_id_index = HelpIdIndex(self.local.keys())
+            return self.local_id_index.resolve_id(element_id, cutoff)
+        return response[1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve help files to ContextualHelp clients over a Unix socket.")
+    parser.add_argument("help_files", nargs="+", help=".ftxt or .fhlp files, or help bundle directories")
+    parser.add_argument("--socket", default=None, help=f"socket path (default {default_socket_path()})")
+    parser.add_argument("--shared", action="store_true", help="allow other local users to connect")
+    args = parser.parse_args(argv)
+
+    daemon = HelpDaemon(args.help_files, args.socket, args.shared)
+    daemon.bind()
+    print(f"Serving {len(daemon.sources)} help file(s) on {daemon.socket_path}")
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,272 @@
+#Exports .ftxt help files as static HTML or Markdown help sites.
+#The help file is streamed one entry at a time (see ftxtformat.iter_ftxt_entries) through a generator
+#pipeline that writes one page per element and feeds the index as it goes, so memory use does not grow
+#with the size of the help file. In HTML the color_*, family_*, size_*, bold, italic and underline tags
+#become CSS classes, with one rule per distinct tag collected into a single style.css. Markdown keeps
+#bold, italic and underline only. Help bundles (see helpbundle.py) are exported one shard per process.
+#
+#Usage:
+#    python helpexport.py help.ftxt site/ [--format html|markdown] [-j N]
+
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from ftxtformat import FORMAT_TAG_PREFIXES, iter_ftxt_entries, line_runs
+from helpbundle import is_bundle, manifest_path
+
+PAGE_DIR = "elements"
+STYLESHEET_NAME = "style.css"
+EXTENSIONS = {"html": ".html", "markdown": ".md"}
+
+BASE_CSS = """body { font-family: sans-serif; max-width: 50em; margin: 2em auto; padding: 0 1em; }
+.ftxt-line { white-space: pre-wrap; min-height: 1.2em; }"""
+CSS_COLOR = re.compile(r"^(#[0-9A-Fa-f]{3,12}|[A-Za-z]+)$")
+MARKDOWN_SPECIAL = re.compile(r"([\\`*_\[\]<>#|])")
+HTML_END = "</body>\n</html>\n"
+
+
+def hashed_name(name, original):
+    # Names that had to be changed get a hash suffix, so two different originals never collide
+    if name != original:
+        name += "-" + hashlib.sha1(original.encode("utf-8")).hexdigest()[:8]
+    return name
+
+
+def page_name(element_id):
+    safe = re.sub(r"[^A-Za-z0-9_.-]", "_", element_id).strip("._") or "element"
+    return hashed_name(safe, element_id)
+
+
+def tag_class(tag):
+    return "ftxt-" + hashed_name(re.sub(r"[^A-Za-z0-9_-]", "-", tag), tag)
+
+
+def tag_rule(tag):
+    # CSS declaration for one .ftxt tag, or None if it has no safe CSS equivalent
+    if tag == "bold":
+        return "font-weight: bold"
+    if tag == "italic":
+        return "font-style: italic"
+    if tag == "underline":
+        return "text-decoration: underline"
+    if tag.startswith("color_") and CSS_COLOR.match(tag[6:]):
+        return f"color: {tag[6:]}"
+    if tag.startswith("family_"):
+        family = re.sub(r'[\\"<>{};\n]', "", tag[7:])
+        return f'font-family: "{family}"' if family else None
+    if tag.startswith("size_") and tag[5:].isdigit():
+        return f"font-size: {int(tag[5:])}pt"  # Tk font sizes are in points
+    return None
+
+
+def stylesheet(tags):
+    rules = [BASE_CSS]
+    for tag in sorted(tags):
+        rule = tag_rule(tag)
+        if rule:
+            rules.append(f".{tag_class(tag)} {{ {rule}; }}")
+    return "\n".join(rules) + "\n"
+
+
+def format_tags(tags):
+    return sorted(tag for tag in tags if tag.startswith(FORMAT_TAG_PREFIXES))
+
+
+def as_lines(lines):
+    return [{"text": lines, "tags": {}}] if isinstance(lines, str) else lines
+
+
+def markdown_escape(text):
+    return MARKDOWN_SPECIAL.sub(r"\\\1", text)
+
+
+def html_lines(lines, used_tags):
+    out = []
+    for line in as_lines(lines):
+        parts = []
+        for text, tags in line_runs(line):
+            tags = format_tags(tags)
+            used_tags.update(tags)
+            if tags:
+                classes = " ".join(tag_class(tag) for tag in tags)
+                parts.append(f'<span class="{classes}">{html.escape(text)}</span>')
+            else:
+                parts.append(html.escape(text))
+        out.append('<div class="ftxt-line">' + "".join(parts) + "</div>")
+    return "\n".join(out)
+
+
+def markdown_lines(lines, used_tags):
+    out = []
+    for line in as_lines(lines):
+        parts = []
+        for text, tags in line_runs(line):
+            tags = format_tags(tags)
+            used_tags.update(tags)
+            stripped = text.strip()
+            if not stripped:
+                parts.append(text)
+                continue
+            # Emphasis markers must touch the text, so surrounding spaces stay outside them
+            inner = markdown_escape(stripped)
+            if "bold" in tags:
+                inner = f"**{inner}**"
+            if "italic" in tags:
+                inner = f"*{inner}*"
+            if "underline" in tags:
+                inner = f"<u>{inner}</u>"
+            lead = text[:len(text) - len(text.lstrip())]
+            trail = text[len(text.rstrip()):]
+            parts.append(lead + inner + trail)
+        out.append("".join(parts))
+    return "  \n".join(out)  # Two trailing spaces keep the line breaks
+
+
+def plain_text(lines):
+    return " ".join(line["text"] for line in as_lines(lines)).strip()
+
+
+def html_head(title, root):
+    return (f'<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n<title>{html.escape(title)}</title>\n'
+            f'<link rel="stylesheet" href="{root}{STYLESHEET_NAME}">\n</head>\n<body>\n')
+
+
+def export_pages(entries, out_dir, output_format, used_tags):
+    # Pipeline stage: writes a page for every element entry and yields index items in its place.
+    # General entries are passed through for the index.
+    extension = EXTENSIONS[output_format]
+    page_dir = os.path.join(out_dir, PAGE_DIR)
+    os.makedirs(page_dir, exist_ok=True)
+    for section, key, lines in entries:
+        if section != "MainWindow":
+            yield section, key, lines
+            continue
+        file_name = page_name(key) + extension
+        if output_format == "html":
+            body = (f'<p><a href="../index.html">Index</a></p>\n<h1>{html.escape(key)}</h1>\n'
+                    f"{html_lines(lines, used_tags)}")
+            page = html_head(key, "../") + body + "\n" + HTML_END
+        else:
+            page = f"[Index](../index.md)\n\n# {markdown_escape(key)}\n\n{markdown_lines(lines, used_tags)}\n"
+        with open(os.path.join(page_dir, file_name), "w", encoding="utf-8") as file:
+            file.write(page)
+        yield section, key, f"{PAGE_DIR}/{file_name}"
+
+
+def write_index(items, out_dir, output_format, used_tags):
+    # Final pipeline stage: the General entries come first, then one link per element page
+    general = {}
+    count = 0
+    header_written = False
+    with open(os.path.join(out_dir, "index" + EXTENSIONS[output_format]), "w", encoding="utf-8") as file:
+        for section, key, value in items:
+            if section != "MainWindow":
+                general[key] = value
+                continue
+            if not header_written:
+                header_written = True
+                file.write(index_header(general, output_format, used_tags))
+            if output_format == "html":
+                file.write(f'<li><a href="{html.escape(value)}">{html.escape(key)}</a></li>\n')
+            else:
+                file.write(f"- [{markdown_escape(key)}]({value})\n")
+            count += 1
+        if not header_written:
+            file.write(index_header(general, output_format, used_tags))
+        if output_format == "html":
+            file.write("</ul>\n" + HTML_END)
+    return count
+
+
+def index_header(general, output_format, used_tags):
+    title = general.get("title", [])
+    description = general.get("description", [])
+    if output_format == "html":
+        return (html_head(plain_text(title) or "Help", "") +
+                f'<header class="ftxt-title">\n{html_lines(title, used_tags)}\n</header>\n'
+                f'<section class="ftxt-description">\n{html_lines(description, used_tags)}\n</section>\n'
+                "<h2>Elements</h2>\n<ul>\n")
+    return (f"# {markdown_lines(title, used_tags) or 'Help'}\n\n{markdown_lines(description, used_tags)}\n\n"
+            "## Elements\n\n")
+
+
+def export_help_file(help_file, out_dir, output_format="html"):
+    used_tags = set()
+    entries = iter_ftxt_entries(help_file)
+    count = write_index(export_pages(entries, out_dir, output_format, used_tags), out_dir, output_format, used_tags)
+    if output_format == "html":
+        with open(os.path.join(out_dir, STYLESHEET_NAME), "w", encoding="utf-8") as file:
+            file.write(stylesheet(used_tags))
+    return count
+
+
+def export_shard(shard_file, element_ids, out_dir, output_format):
+    # Runs in a worker process; returns the index items and the tags used by this shard's pages
+    element_ids = set(element_ids)
+    used_tags = set()
+    entries = (entry for entry in iter_ftxt_entries(shard_file)
+               if entry[0] == "MainWindow" and entry[1] in element_ids)
+    items = [(key, page) for _, key, page in export_pages(entries, out_dir, output_format, used_tags)]
+    return items, used_tags
+
+
+def export_bundle(path, out_dir, output_format="html", jobs=None):
+    manifest_file = manifest_path(path)
+    bundle_dir = os.path.dirname(manifest_file)
+    with open(manifest_file, "r") as file:
+        manifest = json.load(file)
+    shard_elements = {name: [] for name in manifest["shards"]}
+    for element_id, name in manifest["elements"].items():
+        shard_elements[name].append(element_id)  # Only the shard the manifest points to exports an element
+
+    used_tags = set()
+    os.makedirs(os.path.join(out_dir, PAGE_DIR), exist_ok=True)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(export_shard, os.path.join(bundle_dir, shard["file"]), shard_elements[name],
+                                   out_dir, output_format)
+                   for name, shard in manifest["shards"].items()]
+
+        def index_items():
+            for key, lines in manifest.get("General", {}).items():
+                yield "General", key, lines
+            for future in futures:  # In shard order, so the index does not depend on scheduling
+                items, shard_tags = future.result()
+                used_tags.update(shard_tags)
+                for key, page in items:
+                    yield "MainWindow", key, page
+
+        count = write_index(index_items(), out_dir, output_format, used_tags)
+    if output_format == "html":
+        with open(os.path.join(out_dir, STYLESHEET_NAME), "w", encoding="utf-8") as file:
+            file.write(stylesheet(used_tags))
+    return count
+
+
+def export_help(path, out_dir, output_format="html", jobs=None):
+    os.makedirs(out_dir, exist_ok=True)
+    if is_bundle(path):
+        return export_bundle(path, out_dir, output_format, jobs)
+    return export_help_file(path, out_dir, output_format)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export .ftxt help files or bundles as static HTML or Markdown.")
+    parser.add_argument("help_file", help=".ftxt file, or a help bundle directory or manifest")
+    parser.add_argument("out_dir")
+    parser.add_argument("--format", choices=sorted(EXTENSIONS), default="html")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes for bundles")
+    args = parser.parse_args(argv)
+
+    count = export_help(args.help_file, args.out_dir, args.format, args.jobs)
+    print(f"Exported {count} help pages to {args.out_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,75 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, font, colorchooser
 import configparser
-import ast
-from contextualhelp import ContextualHelp
+import itertools
 import json
+import os
+import sys
+import tempfile
+import time
+from contextualhelp import ContextualHelp
+from extractioncache import ExtractionCache
+from analysisworker import AnalysisWorker
+from ftxtformat import FORMAT_TAG_PREFIXES, load_ftxt, make_line
+from helpjournal import HelpJournal
+from helpmodel import FtxtSerializer, content_from_ftxt, content_hash, lines_from_ftxt
+from helprender import compile_render_plan, render_plan
+from helpsearch import HelpSearchIndex
+from helpstats import stats
+
+HELP_FILE = "help_generator.ftxt"
+FONT_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "helpfilegenerator", "fonts.json")
+FONT_CACHE_MAX_AGE = 7 * 24 * 3600  # Seconds; newly installed fonts are picked up after this at the latest
+
+help_system = None  # Created on the first F1 press, see get_help_system
 
-help_system = ContextualHelp("help_generator.ftxt")
+
+def get_help_system():
+    # Loading the generator's own help is deferred until it is first needed, to keep startup fast
+    global help_system
+    if help_system is None:
+        help_system = ContextualHelp(HELP_FILE)
+        help_system.start_prefetch()  # From now on, help for the focused widget is prepared at idle time
+    return help_system
 
 
 def show_help(event):
     focused_widget = event.widget
     element_id = focused_widget.winfo_name()
-    print(f"Element ID: {element_id}")  # Print to debug
-    help_system.display_help(element_id, "tkinter")
+    with stats.timer("f1_help"):
+        get_help_system().display_help(element_id, "tkinter")
+
+
+def read_font_cache(windowing_system):
+    # Font families saved by an earlier run, or None if there are none or they are too old
+    try:
+        if time.time() - os.path.getmtime(FONT_CACHE_FILE) > FONT_CACHE_MAX_AGE:
+            return None
+        with open(FONT_CACHE_FILE, "r") as file:
+            cache = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if cache.get("windowing_system") != windowing_system:
+        return None
+    return cache.get("families")
+
+
+def write_font_cache(windowing_system, families):
+    try:
+        os.makedirs(os.path.dirname(FONT_CACHE_FILE), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(FONT_CACHE_FILE), suffix=".tmp")
+        with os.fdopen(fd, "w") as file:
+            json.dump({"windowing_system": windowing_system, "families": families}, file)
+        os.replace(tmp_path, FONT_CACHE_FILE)
+    except OSError:
+        pass  # The cache is an optimization only
+
+
+def report_startup():
+    # The first idle callback runs after Tk's own pending idle work, which maps and draws the main window
+    stats.mark("first_window")
+    if stats.enabled:
+        print("Startup timeline:\n" + stats.format_timeline(), file=sys.stderr)
 
 
 class FormattedTextEditor:
@@ -48,11 +105,17 @@ class FormattedTextEditor:
         ttk.Button(toolbar, text="Italic", command=self.toggle_italic).pack(side="left", padx=2, pady=2)
         ttk.Button(toolbar, text="Underline", command=self.toggle_underline).pack(side="left", padx=2, pady=2)
 
-        font_families = font.families()
+        # Enumerating the installed fonts can take seconds, so the list comes from a cache and the fonts
+        # are only enumerated when the dropdown is first opened without one
+        self.windowing_system = self.master.tk.call("tk", "windowingsystem")
+        font_families = read_font_cache(self.windowing_system)
+        self.font_families_loaded = font_families is not None
         self.font_family_var = tk.StringVar(value=self.current_font_family)
-        font_family_combo = ttk.Combobox(toolbar, textvariable=self.font_family_var, values=font_families, width=15)
-        font_family_combo.pack(side="left", padx=2, pady=2)
-        font_family_combo.bind("<<ComboboxSelected>>", self.change_font_family)
+        self.font_family_combo = ttk.Combobox(toolbar, textvariable=self.font_family_var,
+                                              values=font_families or [self.current_font_family], width=15,
+                                              postcommand=self.load_font_families)
+        self.font_family_combo.pack(side="left", padx=2, pady=2)
+        self.font_family_combo.bind("<<ComboboxSelected>>", self.change_font_family)
 
         font_sizes = [8, 9, 10, 11, 12, 14, 16, 18, 20, 22, 24, 26, 28, 36, 48, 72]
         self.font_size_var = tk.StringVar(value=self.current_font_size)
@@ -63,6 +126,15 @@ class FormattedTextEditor:
         ttk.Label(toolbar, text="Font Color:").pack(side="left", padx=2, pady=2)
         self.create_color_dropdown(toolbar)
 
+    def load_font_families(self):
+        if self.font_families_loaded:
+            return
+        self.font_families_loaded = True
+        with stats.timer("font_families"):
+            families = list(font.families(self.master))
+        self.font_family_combo["values"] = families
+        write_font_cache(self.windowing_system, families)
+
     def create_color_dropdown(self, parent):
         self.colors = [
             ('#000000', 'Black'), ('#800000', 'Maroon'), ('#008000', 'Green'), ('#808000', 'Olive'),
@@ -114,7 +186,18 @@ class FormattedTextEditor:
     def toggle_underline(self):
         self.toggle_tag("underline")
 
+    def mark_modified(self):
+        # Tag changes do not set the Text widget's modified flag by themselves
+        self.text_widget.edit_modified(True)
+
+    def is_modified(self):
+        return bool(self.text_widget.edit_modified())
+
+    def reset_modified(self):
+        self.text_widget.edit_modified(False)
+
     def toggle_tag(self, tag):
+        self.mark_modified()
         if self.text_widget.tag_ranges(tk.SEL):
             current_tags = self.text_widget.tag_names("sel.first")
             if tag in current_tags:
@@ -131,6 +214,7 @@ class FormattedTextEditor:
     def apply_color(self, color):
         color_tag = f"color_{color}"
         self.text_widget.tag_configure(color_tag, foreground=color)
+        self.mark_modified()
         if self.text_widget.tag_ranges(tk.SEL):
             self.text_widget.tag_add(color_tag, "sel.first", "sel.last")
         else:
@@ -138,6 +222,7 @@ class FormattedTextEditor:
 
     def change_font_family(self, event):
         new_family = self.font_family_var.get()
+        self.mark_modified()
         if self.text_widget.tag_ranges(tk.SEL):
             start, end = self.text_widget.tag_ranges(tk.SEL)
             self.text_widget.tag_remove("family_" + self.current_font_family, start, end)
@@ -149,6 +234,7 @@ class FormattedTextEditor:
 
     def change_font_size(self, event):
         new_size = int(self.font_size_var.get())
+        self.mark_modified()
         if self.text_widget.tag_ranges(tk.SEL):
             start, end = self.text_widget.tag_ranges(tk.SEL)
             self.text_widget.tag_remove("size_" + str(self.current_font_size), start, end)
@@ -159,41 +245,179 @@ class FormattedTextEditor:
         self.current_font_size = new_size
 
     def encode_formatted_text(self):
+        # A single dump call returns every text segment and tag boundary, so formatting that starts
+        # mid-line is kept as character-level runs
+        priority = {tag: rank for rank, tag in enumerate(self.text_widget.tag_names())}
+        active = set()
+        tag_sets = {}
         encoded_content = []
-        for index in range(1, int(self.text_widget.index(tk.END).split('.')[0])):
-            line_start = f"{index}.0"
-            line_end = f"{index}.end"
-            line_text = self.text_widget.get(line_start, line_end)
-            line_tags = {}
-            for tag in self.text_widget.tag_names(line_start):
-                if tag.startswith(("color_", "family_", "size_", "bold", "italic", "underline")):
-                    line_tags[tag] = True
-            # Keep only the last font family and size
-            font_families = [tag for tag in line_tags if tag.startswith("family_")]
-            font_sizes = [tag for tag in line_tags if tag.startswith("size_")]
-            if font_families:
-                line_tags = {tag: line_tags[tag] for tag in line_tags if not tag.startswith("family_") or tag == font_families[-1]}
-            if font_sizes:
-                line_tags = {tag: line_tags[tag] for tag in line_tags if not tag.startswith("size_") or tag == font_sizes[-1]}
-            encoded_content.append({"text": line_text, "tags": line_tags})
+        runs = []
+        for key, value, index in self.text_widget.dump("1.0", "end-1c", tag=True, text=True):
+            if key == "tagon":
+                if value.startswith(FORMAT_TAG_PREFIXES):
+                    active.add(value)
+            elif key == "tagoff":
+                active.discard(value)
+            elif key == "text":
+                state = frozenset(active)
+                line_tags = tag_sets.get(state)
+                if line_tags is None:
+                    line_tags = tag_sets[state] = self.encode_tags(state, priority)
+                parts = value.split("\n")
+                for i, part in enumerate(parts):
+                    if part:
+                        runs.append((part, line_tags))
+                    if i < len(parts) - 1:
+                        if not runs:
+                            runs.append(("", line_tags))  # Empty lines keep the tags of their line break
+                        encoded_content.append(make_line(runs))
+                        runs = []
+        if runs:
+            encoded_content.append(make_line(runs))
         return encoded_content
 
+    def encode_tags(self, tags, priority):
+        ordered = sorted(tags, key=lambda tag: priority.get(tag, -1))
+        # Keep only the font family and size with the highest priority, which are the ones displayed
+        font_families = [tag for tag in ordered if tag.startswith("family_")]
+        font_sizes = [tag for tag in ordered if tag.startswith("size_")]
+        return {tag: True for tag in ordered
+                if (not tag.startswith("family_") or tag == font_families[-1])
+                and (not tag.startswith("size_") or tag == font_sizes[-1])}
+
     def decode_formatted_text(self, encoded_content):
         self.text_widget.delete("1.0", tk.END)
-        for line in encoded_content:
-            self.text_widget.insert(tk.END, line["text"] + "\n")
-            line_start = self.text_widget.index(f"end-2c linestart")
-            line_end = self.text_widget.index(f"end-1c")
-            for tag, _ in line["tags"].items():
-                if tag.startswith("color_"):
-                    self.text_widget.tag_configure(tag, foreground=tag[6:])
-                elif tag.startswith("family_"):
-                    family = tag[7:]
-                    self.text_widget.tag_configure(tag, font=(family, self.current_font_size))
-                elif tag.startswith("size_"):
-                    size = int(tag[5:])
-                    self.text_widget.tag_configure(tag, font=(self.current_font_family, size))
-                self.text_widget.tag_add(tag, line_start, line_end)
+        # Keep the .ftxt tags on the text so encode_formatted_text can read them back
+        render_plan(self.text_widget, compile_render_plan(encoded_content, composite=False))
+
+
+class ElementTreeModel:
+    # Keeps the element Treeview in sync with the help sections by applying diffs instead of rebuilding,
+    # and inserts the rows of large sections lazily, in batches, when the section is first expanded
+    LAZY_THRESHOLD = 500  # Sections with more rows than this start collapsed
+    BATCH_SIZE = 500  # Rows inserted per idle callback while populating a section
+
+    def __init__(self, tree):
+        self.tree = tree
+        self.items = {}  # Section -> {key: (text, type)} as it should be displayed
+        self.populated = {}  # Section -> True once its rows exist in the tree
+        self.pending = {}  # Section -> iterator of keys whose rows are still to insert
+        self.rows = {}  # Row iid -> (section, key)
+        self.tree.bind("<<TreeviewOpen>>", self.on_open, add="+")
+
+    def row_id(self, section, key):
+        return f"{section}:{key}"
+
+    def placeholder_id(self, section):
+        return f"{section}::loading"
+
+    def key_for(self, iid):
+        return self.rows.get(iid)
+
+    def set_section(self, section, items):
+        old_items = self.items.get(section, {})
+        self.items[section] = items
+
+        if not self.tree.exists(section):
+            self.tree.insert("", "end", iid=section, text=section, open=len(items) <= self.LAZY_THRESHOLD)
+            self.populated[section] = False
+        added = [key for key in items if key not in old_items]
+        if len(items) > self.LAZY_THRESHOLD and (len(added) > self.LAZY_THRESHOLD
+                                                 or len(old_items) <= self.LAZY_THRESHOLD):
+            # The section grew past the threshold (a big load, or results streamed into an empty
+            # section): collapse it as if it had been created this large, so its rows load lazily
+            self.tree.item(section, open=False)
+        if (not self.populated[section] or len(added) > self.LAZY_THRESHOLD
+                or not self.tree.tk.getboolean(self.tree.item(section, "open"))):
+            self.reset_section(section)
+            return
+        if section in self.pending and added != list(items)[len(items) - len(added):]:
+            # Rows still being inserted can only be extended at the end
+            self.reset_section(section)
+            return
+
+        removed = [key for key in old_items if key not in items]
+        for key in removed:
+            iid = self.row_id(section, key)
+            if self.rows.pop(iid, None):
+                self.tree.delete(iid)
+        populating = section in self.pending
+        if populating:
+            self.pending[section] = itertools.chain(self.pending[section], added)
+        added = set(added)
+        for index, (key, (text, element_type)) in enumerate(items.items()):
+            iid = self.row_id(section, key)
+            if key in added:
+                if populating:
+                    continue
+                self.tree.insert(section, index, iid=iid, text=text, values=(element_type,))
+                self.rows[iid] = (section, key)
+            elif old_items[key] != (text, element_type) and iid in self.rows:
+                self.tree.item(iid, text=text, values=(element_type,))
+
+    def set_row_text(self, section, key, text):
+        items = self.items.get(section)
+        if items is None or key not in items:
+            return
+        element_type = items[key][1]
+        items[key] = (text, element_type)
+        iid = self.row_id(section, key)
+        if self.tree.exists(iid):
+            self.tree.item(iid, text=text)
+
+    def reset_section(self, section):
+        self.tree.delete(*self.tree.get_children(section))
+        self.rows = {iid: row for iid, row in self.rows.items() if row[0] != section}
+        self.pending.pop(section, None)
+        self.populated[section] = False
+        items = self.items[section]
+        if len(items) <= self.LAZY_THRESHOLD or self.tree.tk.getboolean(self.tree.item(section, "open")):
+            self.populate(section)
+        elif items:
+            self.tree.insert(section, "end", iid=self.placeholder_id(section), text="Loading...")
+
+    def on_open(self, event):
+        section = self.tree.focus()
+        if section in self.items and not self.populated[section]:
+            self.populate(section)
+
+    def populate(self, section):
+        if self.tree.exists(self.placeholder_id(section)):
+            self.tree.delete(self.placeholder_id(section))
+        self.populated[section] = True
+        self.pending[section] = iter(list(self.items[section]))
+        self.insert_batch(section)
+
+    def reveal(self, section, key):
+        if not self.populated.get(section):
+            self.populate(section)
+        while section in self.pending:
+            self.insert_batch(section)
+        iid = self.row_id(section, key)
+        if self.tree.exists(iid):
+            self.tree.item(section, open=True)
+            self.tree.selection_set(iid)
+            self.tree.see(iid)
+
+    def insert_batch(self, section):
+        rows = self.pending.get(section)
+        if rows is None:
+            return
+        items = self.items[section]
+        count = 0
+        for key in rows:
+            if key not in items:
+                continue  # Removed while the section was being populated
+            text, element_type = items[key]
+            iid = self.row_id(section, key)
+            self.tree.insert(section, "end", iid=iid, text=text, values=(element_type,))
+            self.rows[iid] = (section, key)
+            count += 1
+            if count == self.BATCH_SIZE:
+                self.tree.after_idle(self.insert_batch, section)
+                return
+        del self.pending[section]
+
 
 class HelpFileGenerator:
     def __init__(self, master):
@@ -214,7 +438,15 @@ class HelpFileGenerator:
         self.element_info = {}  # Store element name and type information
         self.current_element = None
         self.temp_data = {}  # Temporary storage for unsaved changes
+        self.unsaved = set()  # (section, key) of elements edited since the last save
+        self.saved_hashes = {}  # (section, key) -> content hash as last loaded or saved, computed on demand
+        self.serializer = FtxtSerializer()  # Reuses the JSON of unchanged entries between saves
         self.gui_framework = None  # Will hold detected framework name
+        self.extraction_cache = ExtractionCache()  # Skips re-parsing unchanged files
+        self.analysis_worker = None  # Background analysis process while Analyze is running
+        self.save_format = (1, None)  # .ftxt format version and compression used by save_help_file
+        self.help_file_path = None  # Help file being edited, or the default one for an analyzed source
+        self.journal = None  # Autosave journal for self.help_file_path
 
         # Create and arrange widgets
         self.create_widgets()
@@ -224,6 +456,9 @@ class HelpFileGenerator:
 
     def exit_application(self):
         if messagebox.askokcancel("Exit", "Are you sure you want to exit?"):
+            self.save_current_element_to_temp()
+            if self.journal:
+                self.journal.flush()  # Unsaved edits stay in the journal and are recovered next time
             self.master.destroy()
 
     def create_widgets(self):
@@ -245,8 +480,9 @@ class HelpFileGenerator:
         self.open_help_file_button = ttk.Button(self.button_frame, text="Open Help File", name="open_help_file_button",
                                                 command=self.load_help_file, state=tk.DISABLED)
         self.open_help_file_button.pack(side=tk.LEFT, padx=5)
-        ttk.Button(self.button_frame, text="Analyze", name="analyze_button", command=self.analyze_file).pack(
-            side=tk.LEFT, padx=5)
+        self.analyze_button = ttk.Button(self.button_frame, text="Analyze", name="analyze_button",
+                                         command=self.analyze_file)
+        self.analyze_button.pack(side=tk.LEFT, padx=5)
         ttk.Button(self.button_frame, text="Help", name="help_button", command=self.show_help_window).pack(side=tk.LEFT,
                                                                                                            padx=5)
         self.save_help_file_button = ttk.Button(self.button_frame, text="Save Help File", name="save_help_file_button",
@@ -255,6 +491,16 @@ class HelpFileGenerator:
         ttk.Button(self.button_frame, text="Exit", name="exit_button", command=self.exit_application).pack(
             side=tk.RIGHT, padx=5)
 
+        # Analysis progress, shown while a file is being analyzed
+        self.progress_frame = ttk.Frame(self.main_frame)
+        self.analysis_progress = ttk.Progressbar(self.progress_frame, mode="determinate", maximum=1.0,
+                                                 name="analysis_progress")
+        self.analysis_progress.pack(side=tk.LEFT, expand=True, fill=tk.X)
+        self.analysis_status = ttk.Label(self.progress_frame, text="", width=40)
+        self.analysis_status.pack(side=tk.LEFT, padx=5)
+        ttk.Button(self.progress_frame, text="Cancel", name="cancel_analysis_button",
+                   command=self.cancel_analysis).pack(side=tk.LEFT)
+
         # Split view
         self.paned_window = ttk.PanedWindow(self.main_frame, orient=tk.HORIZONTAL)
         self.paned_window.pack(fill=tk.BOTH, expand=True)
@@ -262,6 +508,15 @@ class HelpFileGenerator:
         # Element tree frame
         self.tree_frame = ttk.Frame(self.paned_window)
         self.paned_window.add(self.tree_frame, weight=1)
+        self.search_frame = ttk.Frame(self.tree_frame)
+        self.search_frame.pack(side=tk.TOP, fill=tk.X, pady=(0, 5))
+        ttk.Label(self.search_frame, text="Search:").pack(side=tk.LEFT)
+        self.search_var = tk.StringVar()
+        self.search_entry = ttk.Entry(self.search_frame, textvariable=self.search_var, name="search_entry")
+        self.search_entry.pack(side=tk.LEFT, padx=5, expand=True, fill=tk.X)
+        self.search_entry.bind("<KeyRelease>", self.on_search_changed)
+        self.search_results_list = tk.Listbox(self.tree_frame, height=6, name="search_results")
+        self.search_results_list.bind("<<ListboxSelect>>", self.on_search_result)
         self.element_tree = ttk.Treeview(self.tree_frame, columns=("Type"), show="tree headings")
         self.element_tree.heading("Type", text="Type")
         self.element_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
@@ -269,6 +524,10 @@ class HelpFileGenerator:
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.element_tree.config(yscrollcommand=scrollbar.set)
         self.element_tree.bind("<<TreeviewSelect>>", self.on_element_select)
+        self.tree_model = ElementTreeModel(self.element_tree)
+        self.search_index = None  # Built on the first search, kept current as elements are edited
+        self.search_results = []
+        self.search_job = None
 
         # Help text frame
         self.text_frame = ttk.Frame(self.paned_window)
@@ -288,113 +547,155 @@ class HelpFileGenerator:
         if not file_path:
             messagebox.showerror("Error", "Please select a Python file.")
             return
+        if self.analysis_worker:
+            return
 
-        with open(file_path, 'r') as file:
-            content = file.read()
-
-        tree = ast.parse(content)
+        self.save_current_element_to_temp()
         self.gui_elements["MainWindow"]["elements"] = {}
         self.element_info = {}
-        self.temp_data = {}
-
-        self.detect_gui_framework(tree)
-        if self.gui_framework:
-            messagebox.showinfo("Framework Detected", f"Detected GUI framework: {self.gui_framework}")
-        else:
-            messagebox.showerror("Error", "No supported GUI framework detected.")
-            return
-
-        self.extract_gui_elements(tree)
+        self.reset_edits()
+        self.current_element = None
+        self.gui_framework = None
         self.update_element_tree()
-        self.save_help_file_button.config(state=tk.NORMAL)  # Enable the Save Help File button
-
-    def detect_gui_framework(self, tree):
-        for node in tree.body:
-            if isinstance(node, ast.Import) or isinstance(node, ast.ImportFrom):
-                for alias in node.names:
-                    if alias.name in ['tkinter', 'Tkinter']:
-                        self.gui_framework = 'Tkinter'
-                    elif alias.name == 'PySimpleGUI':
-                        self.gui_framework = 'PySimpleGUI'
-                    elif alias.name.startswith('PyQt'):
-                        self.gui_framework = 'PyQt'
-
-    def extract_gui_elements(self, node):
-        if isinstance(node, ast.Assign):
-            if self.gui_framework == 'PyQt' and isinstance(node.value, ast.Call):
-                element_name = node.targets[0].id  # Variable name
-                element_type = node.value.func.attr  # Widget type (e.g., QPushButton)
-                self.add_element(element_name, element_type)
-        elif isinstance(node, ast.Call):
-            if isinstance(node.func, ast.Attribute):
-                element_type = node.func.attr
-                element_name = self.get_element_name(node)
-                if self.is_gui_element(element_type):
-                    self.add_element(element_name, element_type)
-
-        for child in ast.iter_child_nodes(node):
-            self.extract_gui_elements(child)
-
-    def get_element_name(self, node):
-        if self.gui_framework == 'Tkinter':
-            for kw in node.keywords:
-                if kw.arg == 'name':
-                    return ast.literal_eval(kw.value)
-        elif self.gui_framework == 'PySimpleGUI':
-            for kw in node.keywords:
-                if kw.arg == 'key':
-                    return ast.literal_eval(kw.value)
-        return None
-
-    def is_gui_element(self, element_type):
-        gui_elements = ['Button', 'Label', 'Entry', 'Text', 'Listbox', 'Combobox', 'InputText', 'Combo', 'Multiline']
-        return element_type in gui_elements
-
-    def add_element(self, element_name, element_type):
-        base_name = element_name
-        counter = 1
-        original_name = element_name
-
-        # Ensure unique names
-        while element_name in self.gui_elements["MainWindow"]["elements"]:
-            element_name = f"{base_name}_{counter}"
-            counter += 1
-
-        if original_name not in self.element_info:
-            self.gui_elements["MainWindow"]["elements"][element_name] = ""
-            self.element_info[element_name] = element_type
 
-    def update_element_tree(self):
-        self.element_tree.delete(*self.element_tree.get_children())
-
-        # Insert "General" section
-        general_node = self.element_tree.insert("", "end", text="General", open=True)
-        general = self.gui_elements.get("General", {})
-        self.element_tree.insert(general_node, "end", text="Title", values=(general.get("title", "")))
-        self.element_tree.insert(general_node, "end", text="Description", values=(general.get("description", "")))
+        # Parsing and extraction run in a separate process; results stream back through poll_analysis
+        self.analyzed_file_path = file_path
+        self.analysis_worker = AnalysisWorker(file_path, self.extraction_cache.cache_dir)
+        self.analysis_worker.start()
+        self.analyze_button.config(state=tk.DISABLED)
+        # Until the analysis is done, saving would write partial results over the previous help file
+        self.save_help_file_button.config(state=tk.DISABLED)
+        self.analysis_progress["value"] = 0
+        self.analysis_status.config(text="Analyzing...")
+        self.progress_frame.pack(fill=tk.X, pady=(0, 10), before=self.paned_window)
+        self.master.after(50, self.poll_analysis, self.analysis_worker)
+
+    def poll_analysis(self, worker):
+        if worker is None or worker is not self.analysis_worker:
+            return  # Cancelled, for example by loading a help file; its results no longer apply
+        elements = self.gui_elements["MainWindow"]["elements"]
+        changed = False
+        for kind, value in worker.poll():
+            if kind == "framework":
+                self.gui_framework = value
+                if value:
+                    self.analysis_status.config(text=f"Detected GUI framework: {value}")
+            elif kind == "elements":
+                for name, element_type in value:
+                    elements[name] = ""
+                    self.element_info[name] = element_type
+                changed = True
+            elif kind == "progress":
+                self.analysis_progress["value"] = value
+            elif kind == "timing":
+                stats.record(*value)  # Parse and extract times measured in the worker process
+            elif kind == "done":
+                self.finish_analysis()
+                if not self.gui_framework:
+                    messagebox.showerror("Error", "No supported GUI framework detected.")
+                    return
+                messagebox.showinfo("Framework Detected", f"Detected GUI framework: {self.gui_framework}")
+                self.open_journal(os.path.splitext(self.analyzed_file_path)[0] + ".ftxt")
+                self.update_element_tree()
+                self.save_help_file_button.config(state=tk.NORMAL)  # Enable the Save Help File button
+                return
+            elif kind == "error":
+                self.finish_analysis()
+                messagebox.showerror("Error", f"Could not analyze file: {value}")
+                return
+        if changed:
+            self.update_element_tree()  # Show the elements found so far
+        self.master.after(50, self.poll_analysis, worker)
+
+    def cancel_analysis(self):
+        if self.analysis_worker:
+            self.analysis_worker.cancel()
+            self.finish_analysis()
+
+    def finish_analysis(self):
+        self.analysis_worker = None
+        self.analysis_progress["value"] = 1.0
+        self.progress_frame.pack_forget()
+        self.analyze_button.config(state=tk.NORMAL)
+
+    def get_search_index(self):
+        if self.search_index is None:
+            self.search_index = HelpSearchIndex()
+            for key in ("title", "description"):
+                content = self.temp_data.get(("General", key), self.gui_elements["General"].get(key, []))
+                self.search_index.add(("General", key), key, content)
+            for name, content in self.gui_elements["MainWindow"]["elements"].items():
+                content = self.temp_data.get(("MainWindow", name), content)
+                self.search_index.add(("MainWindow", name), name, content)
+        return self.search_index
+
+    def on_search_changed(self, event):
+        # Wait for a short pause in typing before searching
+        if self.search_job is not None:
+            self.master.after_cancel(self.search_job)
+        self.search_job = self.master.after(150, self.run_search)
+
+    def run_search(self):
+        self.search_job = None
+        query = self.search_var.get()
+        self.search_results = [key for key, score in self.get_search_index().search(query, 50)] if query else []
+        self.search_results_list.delete(0, tk.END)
+        if self.search_results:
+            self.search_results_list.insert(tk.END, *[f"{name} ({section})" for section, name in self.search_results])
+            self.search_results_list.pack(side=tk.TOP, fill=tk.X, pady=(0, 5), before=self.element_tree)
+        else:
+            self.search_results_list.pack_forget()
 
-        # Insert "MainWindow" elements
-        main_window_node = self.element_tree.insert("", "end", text="MainWindow", open=True)
-        main_window = self.gui_elements.get("MainWindow", {}).get("elements", {})
-        for name, description in main_window.items():
-            self.element_tree.insert(main_window_node, "end", text=f"{name} ({self.element_info.get(name, 'Unknown')})",
-                                     values=(description))
+    def on_search_result(self, event):
+        selection = self.search_results_list.curselection()
+        if selection:
+            section, name = self.search_results[selection[0]]
+            self.tree_model.reveal(section, name)
 
     def update_element_tree(self):
-        self.element_tree.delete(*self.element_tree.get_children())
-
-        # Insert "General" section
-        general_node = self.element_tree.insert("", "end", text="General", open=True)
-        general = self.gui_elements.get("General", {})
-        self.element_tree.insert(general_node, "end", text="Title", values=("",))
-        self.element_tree.insert(general_node, "end", text="Description", values=("",))
+        self.search_index = None
+        with stats.timer("tree_update"):
+            self.tree_model.set_section("General", {key: (self.row_text("General", key), "")
+                                                    for key in ("title", "description")})
+            main_window = self.gui_elements.get("MainWindow", {}).get("elements", {})
+            self.tree_model.set_section("MainWindow", {name: (self.row_text("MainWindow", name),
+                                                              self.element_info.get(name, 'Unknown'))
+                                                       for name in main_window})
+
+    def row_text(self, section, key):
+        text = key.capitalize() if section == "General" else key
+        return text + " *" if (section, key) in self.unsaved else text  # * marks unsaved edits
+
+    def set_unsaved(self, row, unsaved):
+        if unsaved == (row in self.unsaved):
+            return
+        if unsaved:
+            self.unsaved.add(row)
+        else:
+            self.unsaved.discard(row)
+        self.tree_model.set_row_text(row[0], row[1], self.row_text(*row))
 
-        # Insert "MainWindow" elements
-        main_window_node = self.element_tree.insert("", "end", text="MainWindow", open=True)
-        main_window = self.gui_elements.get("MainWindow", {}).get("elements", {})
-        for name, description in main_window.items():
-            self.element_tree.insert(main_window_node, "end", text=f"{name} ({self.element_info.get(name, 'Unknown')})",
-                                     values=("",))
+    def reset_edits(self):
+        self.temp_data = {}
+        self.unsaved = set()
+        self.saved_hashes = {}
+        self.serializer = FtxtSerializer()
+
+    def saved_content(self, row):
+        section, key = row
+        if section == "General":
+            return self.gui_elements[section].get(key, [])
+        return self.gui_elements[section]["elements"].get(key, [])
+
+    def saved_hash(self, row):
+        digest = self.saved_hashes.get(row)
+        if digest is None:
+            saved = self.saved_content(row)
+            if isinstance(saved, str):
+                # Plain string entries come back from the editor as one untagged line, or none if empty
+                saved = [{"text": saved, "tags": {}}] if saved else []
+            digest = self.saved_hashes[row] = content_hash(lines_from_ftxt(saved))
+        return digest
 
     def on_element_select(self, event):
         self.save_current_element_to_temp()
@@ -402,37 +703,54 @@ class HelpFileGenerator:
         if not selected_item:
             return
 
-        selected_item = selected_item[0]
-        parent = self.element_tree.parent(selected_item)
-        if parent:
-            section = self.element_tree.item(parent)['text']
-            element_name = self.element_tree.item(selected_item)['text'].split('(')[0].strip()
-
-            if section == "General":
-                self.current_element = (section, element_name.lower())
-                content = self.temp_data.get((section, element_name.lower()),
-                                             self.gui_elements[section].get(element_name.lower(), []))
-            else:
-                self.current_element = (section, element_name.lower())
-                content = self.temp_data.get((section, element_name.lower()),
-                                             self.gui_elements[section]["elements"].get(element_name.lower(), []))
+        row = self.tree_model.key_for(selected_item[0])
+        if row:
+            self.current_element = row
+            content = self.temp_data.get(row, self.saved_content(row))
 
             self.help_text.text_widget.delete("1.0", tk.END)
-            if isinstance(content, list):
-                self.help_text.decode_formatted_text(content)
+            if isinstance(content, (tuple, list)):
+                with stats.timer("decode"):
+                    self.help_text.decode_formatted_text(content)
             elif isinstance(content, str):
                 self.help_text.text_widget.insert(tk.END, content)
             else:
                 messagebox.showwarning("Warning", "The content for this element seems to be corrupted.")
+            self.help_text.reset_modified()  # Only edits made from now on need encoding
 
     def save_current_element_to_temp(self):
-        if self.current_element:
-            section, element_name = self.current_element
-            content = self.help_text.encode_formatted_text()
-            if section == "General":
-                self.temp_data[(section, element_name)] = content
+        # Elements that were only looked at are not encoded again
+        if self.current_element and self.help_text.is_modified():
+            row = self.current_element
+            section, element_name = row
+            with stats.timer("encode"):
+                encoded = self.help_text.encode_formatted_text()
+            self.help_text.reset_modified()
+            content = lines_from_ftxt(encoded)  # Kept in memory as compact Line objects
+            if content_hash(content) == self.saved_hash(row):
+                self.temp_data.pop(row, None)  # Edited back to what is saved
+                self.set_unsaved(row, False)
             else:
-                self.temp_data[(section, element_name)] = content
+                self.temp_data[row] = content
+                self.set_unsaved(row, True)
+            if self.search_index is not None:
+                self.search_index.add(row, element_name, content)
+            if self.journal:
+                self.journal.record(section, element_name, encoded)
+
+    def open_journal(self, help_file_path):
+        if self.journal:
+            self.journal.flush()
+        self.current_element = None
+        self.help_file_path = help_file_path
+        self.journal = HelpJournal(help_file_path)
+        # Edits left behind by a session that ended without saving are recovered automatically
+        recovered = self.journal.replay()
+        if recovered:
+            for row, lines in recovered.items():
+                self.temp_data[row] = lines_from_ftxt(lines)
+                self.unsaved.add(row)
+            messagebox.showinfo("Recovered", f"Recovered {len(recovered)} unsaved edits from the previous session.")
 
     def show_help_window(self):
         help_text = "Press F1 while button is in focus to see detailed help."
@@ -442,11 +760,12 @@ class HelpFileGenerator:
         file_path = filedialog.askopenfilename(filetypes=[("Formatted Text Files", "*.ftxt")])
         if not file_path:
             return
+        self.cancel_analysis()  # Otherwise its results would be merged into the loaded file
 
-        with open(file_path, "r") as file:
-            content = json.load(file)
+        content, version, compression = load_ftxt(file_path)
+        self.save_format = (version, compression)  # Save back in the format the file was loaded in
 
-        self.gui_elements = {
+        gui_elements = {
             "General": {
                 "title": content.get("General", {}).get("title", []),
                 "description": content.get("General", {}).get("description", [])
@@ -457,17 +776,22 @@ class HelpFileGenerator:
         }
 
         # Convert string content to list format for compatibility
-        for key, value in self.gui_elements["MainWindow"]["elements"].items():
+        for key, value in gui_elements["MainWindow"]["elements"].items():
             if isinstance(value, str):
-                self.gui_elements["MainWindow"]["elements"][key] = [{"text": value, "tags": {}}]
+                gui_elements["MainWindow"]["elements"][key] = [{"text": value, "tags": {}}]
+        self.gui_elements = content_from_ftxt(gui_elements)  # Held as compact Line objects
 
-        self.temp_data = {}  # Clear temp data
+        self.reset_edits()
+        self.open_journal(file_path)
         self.update_element_tree()
 
     def save_help_file(self):
         self.save_current_element_to_temp()  # Save any unsaved changes
 
-        file_path = filedialog.asksaveasfilename(defaultextension=".ftxt", filetypes=[("Formatted Text Files", "*.ftxt")])
+        initial_path = self.help_file_path or ""
+        file_path = filedialog.asksaveasfilename(defaultextension=".ftxt", filetypes=[("Formatted Text Files", "*.ftxt")],
+                                                 initialdir=os.path.dirname(initial_path) or None,
+                                                 initialfile=os.path.basename(initial_path) or None)
         if not file_path:
             return
 
@@ -481,27 +805,57 @@ class HelpFileGenerator:
             }
         }
 
-        # Update content with temp_data
-        for (section, element), data in self.temp_data.items():
-            if section == "MainWindow":
-                content["MainWindow"]["elements"][element] = data
-
-        # Add any elements from gui_elements that are not in temp_data
+        # Elements keep their order; edited ones take their content from temp_data
+        elements = content["MainWindow"]["elements"]
         for element, data in self.gui_elements["MainWindow"]["elements"].items():
-            if ("MainWindow", element) not in self.temp_data:
-                content["MainWindow"]["elements"][element] = data
-
-        with open(file_path, "w") as file:
-            json.dump(content, file, indent=2)
-
-        messagebox.showinfo("Success", "Help file saved successfully.")
+            elements[element] = self.temp_data.get(("MainWindow", element), data)
+        for (section, element), data in self.temp_data.items():
+            if section == "MainWindow" and element not in elements:
+                elements[element] = data
+
+        # The journal thread writes the file atomically, re-serializing only the entries that changed
+        # since the last save; edits made meanwhile go to the new journal
+        if self.journal is None:
+            self.journal = HelpJournal(file_path)
+        future = self.journal.compact(file_path, content, *self.save_format, serializer=self.serializer)
+        if file_path != self.help_file_path:
+            self.help_file_path = file_path
+            self.journal = HelpJournal(file_path)
+        self.wait_for_save(future, dict(self.temp_data))
+
+    def wait_for_save(self, future, saved_edits):
+        if not future.done():
+            self.master.after(50, self.wait_for_save, future, saved_edits)
+        elif future.exception():
+            messagebox.showerror("Error", f"Could not save help file: {future.exception()}")
+        else:
+            self.mark_saved(saved_edits)
+            messagebox.showinfo("Success", "Help file saved successfully.")
+
+    def mark_saved(self, saved_edits):
+        # Edits that are now in the file become the saved content, unless they were edited again meanwhile
+        for row, lines in saved_edits.items():
+            if self.temp_data.get(row) is not lines:
+                continue
+            section, key = row
+            if section == "General":
+                self.gui_elements[section][key] = lines
+            else:
+                self.gui_elements[section]["elements"][key] = lines
+            del self.temp_data[row]
+            self.saved_hashes.pop(row, None)
+            self.set_unsaved(row, False)
 
 
 if __name__ == "__main__":
+    stats.mark("imports")
     root = tk.Tk()
+    stats.mark("tk_root")
     s = ttk.Style()
     s.theme_use('classic')
     # help_file = "help_generator.ftxt"
 
     app = HelpFileGenerator(root)
+    stats.mark("widgets")
+    root.after_idle(report_startup)
     root.mainloop()
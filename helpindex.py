@@ -0,0 +1,129 @@
+#Compiled help files with a byte-offset index.
+#compile_help turns an .ftxt authoring file into an .fhlp file: a small header, one JSON body per
+#help entry and a JSON index mapping every element ID to the offset, length and hash of its body.
+#CompiledHelp maps the file with mmap and decodes only the entries that are actually requested,
+#so opening a multi-megabyte help file costs little more than reading its index. Decoded entries are
+#kept as tuples of helpmodel Line objects.
+#
+#Usage:
+#    python helpindex.py help.ftxt [more.ftxt ...]    # writes help.fhlp next to each file
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+
+from ftxtformat import read_ftxt
+from helpmodel import lines_from_ftxt
+
+MAGIC = b"FHLP\x00\x01\x00\x00"
+HEADER = struct.Struct("<8sQQ")  # magic, index offset, index length
+
+
+def restructure_help_content(content):
+    # Flatten the .ftxt layout into element ID -> list of lines, as ContextualHelp uses it
+    help_info = {}
+    if "General" in content:
+        help_info["title"] = content["General"].get("title", [])
+        help_info["description"] = content["General"].get("description", [])
+
+    if "MainWindow" in content and "elements" in content["MainWindow"]:
+        for element, data in content["MainWindow"]["elements"].items():
+            help_info[element] = data if isinstance(data, list) else [{"text": data, "tags": {}}]
+    return help_info
+
+
+def compiled_path(help_file):
+    return os.path.splitext(help_file)[0] + ".fhlp"
+
+
+def compile_help(help_file, out_path=None):
+    out_path = out_path or compiled_path(help_file)
+    help_info = restructure_help_content(read_ftxt(help_file))
+
+    entries = {}
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "wb") as out:
+        out.write(HEADER.pack(MAGIC, 0, 0))
+        for element_id, data in help_info.items():
+            body = json.dumps(data, separators=(",", ":")).encode("utf-8")
+            entries[element_id] = [out.tell(), len(body), hashlib.sha1(body).hexdigest()[:16]]
+            out.write(body)
+        index = json.dumps({"source": os.path.basename(help_file), "entries": entries},
+                           separators=(",", ":")).encode("utf-8")
+        index_offset = out.tell()
+        out.write(index)
+        out.seek(0)
+        out.write(HEADER.pack(MAGIC, index_offset, len(index)))
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+def fresh_compiled_path(help_file):
+    # The compiled file is only used while it is at least as new as its source
+    path = compiled_path(help_file)
+    try:
+        if os.path.getmtime(path) >= os.path.getmtime(help_file):
+            return path
+    except OSError:
+        pass
+    return None
+
+
+class CompiledHelp:
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_offset, index_length = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC or index_offset + index_length > len(self.map):
+            self.map.close()
+            raise ValueError(f"Not a compiled help file: {path}")
+        index = json.loads(self.map[index_offset:index_offset + index_length])
+        self.entries = index["entries"]
+        self.decoded = {}
+
+    def __contains__(self, element_id):
+        return element_id in self.entries
+
+    def __getitem__(self, element_id):
+        data = self.decoded.get(element_id)
+        if data is None:
+            offset, length, _ = self.entries[element_id]
+            data = lines_from_ftxt(json.loads(self.map[offset:offset + length]))
+            self.decoded[element_id] = data
+        return data
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, element_id, default=None):
+        if element_id in self.entries:
+            return self[element_id]
+        return default
+
+    def keys(self):
+        return self.entries.keys()
+
+    def items(self):
+        for element_id in self.entries:
+            yield element_id, self[element_id]
+
+    def entry_hash(self, element_id):
+        return self.entries[element_id][2]
+
+    def close(self):
+        self.map.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python helpindex.py help.ftxt [more.ftxt ...]", file=sys.stderr)
+        sys.exit(2)
+    for help_file in sys.argv[1:]:
+        print(f"{help_file} -> {compile_help(help_file)}")
@@ -0,0 +1,109 @@
+#Append-only autosave journal for help file edits.
+#Every element edit is appended as one JSON line to "<help file>.journal" by a background thread,
+#so a crash loses at most the edit in progress and the editor never blocks on disk I/O.
+#compact writes the full help file to a temporary file and renames it over the target, after which the
+#journal is removed. Given a helpmodel FtxtSerializer, compact only re-serializes changed entries.
+#replay returns the edits of a journal left behind by an earlier session.
+
+import json
+import os
+import queue
+import threading
+from concurrent.futures import Future
+
+from ftxtformat import write_ftxt, write_ftxt_text
+from helpstats import stats
+
+
+def journal_path(help_file):
+    return help_file + ".journal"
+
+
+class HelpJournal:
+    def __init__(self, help_file):
+        self.help_file = help_file
+        self.path = journal_path(help_file)
+        self.queue = queue.Queue()
+        self.thread = None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name="help-journal", daemon=True)
+            self.thread.start()
+
+    def record(self, section, element, content):
+        data = json.dumps({"section": section, "element": element, "content": content}, separators=(",", ":"))
+        self.start()
+        self.queue.put(("record", data))
+
+    def compact(self, target_path, content, version=1, compression=None, serializer=None):
+        # content must not be modified after this call; it is written from the journal thread
+        future = Future()
+        self.start()
+        self.queue.put(("compact", (target_path, content, version, compression, serializer, future)))
+        return future
+
+    def flush(self):
+        if self.thread is not None:
+            self.queue.join()
+
+    def run(self):
+        while True:
+            records = []
+            kind, item = self.queue.get()
+            done = 1
+            while kind == "record":
+                records.append(item)
+                try:
+                    kind, item = self.queue.get_nowait()
+                    done += 1
+                except queue.Empty:
+                    kind = None
+            if records:
+                self.append(records)
+            if kind == "compact":
+                self.write_help_file(*item)
+            for _ in range(done):
+                self.queue.task_done()
+
+    def append(self, records):
+        try:
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.write("\n".join(records) + "\n")
+        except OSError:
+            pass  # Autosave is best effort; the edits are still in memory
+
+    def write_help_file(self, target_path, content, version, compression, serializer, future):
+        try:
+            tmp_path = target_path + ".tmp"
+            try:
+                with stats.timer("save"):
+                    if serializer is not None:
+                        write_ftxt_text(tmp_path, serializer.serialize(content, version), compression)
+                    else:
+                        write_ftxt(tmp_path, content, version, compression)
+                    os.replace(tmp_path, target_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            if os.path.exists(self.path):
+                os.remove(self.path)  # Every journaled edit is now part of the help file
+        except Exception as e:
+            future.set_exception(e)
+        else:
+            future.set_result(target_path)
+
+    def replay(self):
+        edits = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break  # A torn last line from a crash
+                    edits[(record["section"], record["element"])] = record["content"]
+        except OSError:
+            pass
+        return edits
@@ -0,0 +1,301 @@
+#Headless validator for .ftxt help files.
+#Checks the structure of every entry, the tag vocabulary (bold, italic, underline, color_*, family_*,
+#size_*), color values and integer font sizes, so malformed help is found before it is displayed.
+#With --source, the GUI elements extracted from the given Python files (see batchanalyzer.py) are
+#compared with the documented ones: elements that no longer exist in the source are reported as
+#orphaned, and extracted elements without help as missing.
+#Help files are read one entry at a time (see ftxtformat.iter_ftxt_entries) and checked in parallel
+#worker processes. The report is JSON, or JSON Lines with one issue per line followed by a summary.
+#
+#Usage:
+#    python helplint.py help/ app.ftxt [--source src/] [--format json|jsonl] [-o report.json] [-j N]
+
+import argparse
+import gzip
+import json
+import lzma
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from batchanalyzer import SKIP_DIRS, analyze_paths, find_python_files
+from ftxtformat import iter_ftxt_entries
+
+FLAG_TAGS = {"bold", "italic", "underline"}
+HEX_COLOR = re.compile(r"^#(?:[0-9A-Fa-f]{3}){1,4}$")  # #rgb up to #rrrrggggbbbb, as Tk accepts
+NAMED_COLOR = re.compile(r"^[A-Za-z][A-Za-z0-9 ]*$")
+# Tk's portable color names (see colors(n)), lowercase without spaces, as Tk matches them
+TK_COLOR_NAMES = frozenset("""
+    aliceblue antiquewhite aqua aquamarine azure beige bisque black blanchedalmond blue blueviolet
+    brown burlywood cadetblue chartreuse chocolate coral cornflowerblue cornsilk crimson cyan
+    darkblue darkcyan darkgoldenrod darkgray darkgreen darkgrey darkkhaki darkmagenta darkolivegreen
+    darkorange darkorchid darkred darksalmon darkseagreen darkslateblue darkslategray darkslategrey
+    darkturquoise darkviolet deeppink deepskyblue dimgray dimgrey dodgerblue firebrick floralwhite
+    forestgreen fuchsia gainsboro ghostwhite gold goldenrod gray green greenyellow grey honeydew
+    hotpink indianred indigo ivory khaki lavender lavenderblush lawngreen lemonchiffon lightblue
+    lightcoral lightcyan lightgoldenrod lightgoldenrodyellow lightgray lightgreen lightgrey
+    lightpink lightsalmon lightseagreen lightskyblue lightslateblue lightslategray lightslategrey
+    lightsteelblue lightyellow lime limegreen linen magenta maroon mediumaquamarine mediumblue
+    mediumorchid mediumpurple mediumseagreen mediumslateblue mediumspringgreen mediumturquoise
+    mediumvioletred midnightblue mintcream mistyrose moccasin navajowhite navy navyblue oldlace
+    olive olivedrab orange orangered orchid palegoldenrod palegreen paleturquoise palevioletred
+    papayawhip peachpuff peru pink plum powderblue purple red rosybrown royalblue saddlebrown salmon
+    sandybrown seagreen seashell sienna silver skyblue slateblue slategray slategrey snow
+    springgreen steelblue tan teal thistle tomato turquoise violet violetred wheat white whitesmoke
+    yellow yellowgreen
+""".split())
+# Names that also exist with the suffixes 1 to 4, e.g. "SeaGreen3"
+TK_NUMBERED_COLORS = frozenset("""
+    antiquewhite aquamarine azure bisque blue brown burlywood cadetblue chartreuse chocolate coral
+    cornsilk cyan darkgoldenrod darkolivegreen darkorange darkorchid darkseagreen darkslategray
+    deeppink deepskyblue dodgerblue firebrick gold goldenrod green honeydew hotpink indianred ivory
+    khaki lavenderblush lemonchiffon lightblue lightcyan lightgoldenrod lightpink lightsalmon
+    lightskyblue lightsteelblue lightyellow magenta maroon mediumorchid mediumpurple mistyrose
+    navajowhite olivedrab orange orangered orchid palegreen paleturquoise palevioletred peachpuff
+    pink plum purple red rosybrown royalblue salmon seagreen seashell sienna skyblue slateblue
+    slategray snow springgreen steelblue tan thistle tomato turquoise violetred wheat yellow
+""".split())
+TK_GRAY_LEVEL = re.compile(r"^gr[ae]y(?:100|[1-9]?[0-9])$")  # gray0 to gray100
+GENERAL_KEYS = ("title", "description")
+SEVERITIES = ("error", "warning", "info")
+
+
+def find_help_files(paths):
+    for path in paths:
+        if os.path.isfile(path):
+            yield path
+            continue
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith(".") and d not in SKIP_DIRS)
+            for filename in sorted(filenames):
+                if filename.endswith(".ftxt"):
+                    yield os.path.join(dirpath, filename)
+
+
+def issue(severity, code, message, file, section=None, element=None, line=None):
+    return {"severity": severity, "code": code, "message": message, "file": file,
+            "section": section, "element": element, "line": line}
+
+
+def is_tk_color_name(color):
+    name = color.replace(" ", "").lower()
+    if name in TK_COLOR_NAMES or TK_GRAY_LEVEL.match(name):
+        return True
+    if name.startswith("system"):
+        return True  # Platform colors such as SystemButtonFace (Windows) or systemTextColor (macOS)
+    return name[-1] in "1234" and name[:-1] in TK_NUMBERED_COLORS
+
+
+def tag_problem(tag):
+    # (code, message) for a tag that cannot be displayed as intended, or None
+    if tag in FLAG_TAGS:
+        return None
+    if tag.startswith("color_"):
+        color = tag[6:]
+        if HEX_COLOR.match(color):
+            return None
+        if NAMED_COLOR.match(color):
+            if is_tk_color_name(color):
+                return None
+            return "unknown-color", f"Color name in tag {tag!r} is not in Tk's color table"
+        return "bad-color", f"Invalid color in tag {tag!r}"
+    if tag.startswith("family_"):
+        if tag[7:].strip():
+            return None
+        return "bad-family", f"Empty font family in tag {tag!r}"
+    if tag.startswith("size_"):
+        if tag[5:].isdigit() and int(tag[5:]) > 0:
+            return None
+        return "bad-size", f"Font size is not a positive integer in tag {tag!r}"
+    return "unknown-tag", f"Unknown tag {tag!r} is ignored when displayed"
+
+
+def check_tags(item, report):
+    if "tags" not in item:
+        report("error", "schema", "Missing tags object")
+        return
+    tags = item["tags"]
+    if not isinstance(tags, dict):
+        report("error", "schema", f"Tags must be an object, not {type(tags).__name__}")
+        return
+    for tag, value in tags.items():
+        if value is not True:
+            report("error", "schema", f"Tag {tag!r} must map to true")
+        problem = tag_problem(tag)
+        if problem:
+            report("warning" if problem[0] in ("unknown-tag", "unknown-color") else "error", *problem)
+    for prefix in ("family_", "size_"):
+        if sum(1 for tag in tags if tag.startswith(prefix)) > 1:
+            report("warning", "conflicting-font", f"More than one {prefix}* tag; only one of them is displayed")
+
+
+def check_line(line, report):
+    if not isinstance(line, dict):
+        report("error", "schema", f"Line must be an object, not {type(line).__name__}")
+        return
+    text = line.get("text")
+    if not isinstance(text, str):
+        report("error", "schema", "Line has no text string")
+    check_tags(line, report)
+    runs = line.get("runs")
+    if runs is None:
+        return
+    if not isinstance(runs, list):
+        report("error", "schema", "Runs must be a list")
+        return
+    run_texts = []
+    for run in runs:
+        if not isinstance(run, dict) or not isinstance(run.get("text"), str):
+            report("error", "schema", "Run must be an object with a text string")
+            return
+        run_texts.append(run["text"])
+        check_tags(run, report)
+    if isinstance(text, str) and "".join(run_texts) != text:
+        report("error", "runs-mismatch", "Runs do not add up to the line text")
+
+
+def check_entry(lines, report):
+    # Returns False if the entry has no text at all
+    if isinstance(lines, str):
+        return bool(lines.strip())
+    if not isinstance(lines, list):
+        report("error", "schema", f"Entry must be a string or a list of lines, not {type(lines).__name__}")
+        return True
+    has_text = False
+    for number, line in enumerate(lines, 1):
+        check_line(line, lambda *args: report(*args, line=number))
+        if isinstance(line, dict) and isinstance(line.get("text"), str) and line["text"].strip():
+            has_text = True
+    return has_text
+
+
+def lint_file(path):
+    # Runs in a worker process; returns (path, issues, documented element IDs)
+    issues = []
+    element_ids = []
+    general = set()
+    try:
+        for section, key, lines in iter_ftxt_entries(path):
+            def report(severity, code, message, line=None):
+                issues.append(issue(severity, code, message, path, section, key, line))
+
+            if section == "General":
+                general.add(key)
+            else:
+                element_ids.append(key)
+            if not check_entry(lines, report):
+                report("info", "empty-help", "Entry has no help text")
+    except (OSError, ValueError, KeyError, IndexError, TypeError, EOFError, lzma.LZMAError, gzip.BadGzipFile) as e:
+        issues.append(issue("error", "parse-error", f"{type(e).__name__}: {e}", path))
+        return path, issues, element_ids
+    for key in GENERAL_KEYS:
+        if key not in general:
+            issues.append(issue("warning", "missing-general", f"General section has no {key!r}", path, "General", key))
+    if not element_ids:
+        issues.append(issue("warning", "no-elements", "Help file documents no elements", path, "MainWindow"))
+    return path, issues, element_ids
+
+
+def lint_files(help_files, jobs=None):
+    # Yields lint_file results in file order as they complete
+    if jobs == 1 or len(help_files) < 2:
+        for path in help_files:
+            yield lint_file(path)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(lint_file, help_files)
+
+
+def source_elements(source_paths, jobs=None):
+    # Element IDs extracted from the sources, with the module each was first seen in
+    elements = {}
+    errors = []
+    for file_path, framework, element_info, error in analyze_paths(list(find_python_files(source_paths)), jobs):
+        if error:
+            errors.append(issue("warning", "source-error", error, file_path))
+        for name in element_info:
+            elements.setdefault(name, file_path)
+    return elements, errors
+
+
+def coverage_issues(documented, elements):
+    issues = []
+    for element_id, path in documented.items():
+        if element_id not in elements:
+            issues.append(issue("warning", "orphaned-element", "Element not found in the analyzed source",
+                                path, "MainWindow", element_id))
+    for element_id, source in elements.items():
+        if element_id not in documented:
+            issues.append(issue("warning", "missing-element", "Element has no entry in any help file",
+                                source, "MainWindow", element_id))
+    return issues
+
+
+class Report:
+    # Writes issues as they are found (JSON Lines) or collects them for one JSON document
+    def __init__(self, output, output_format):
+        self.output = output
+        self.output_format = output_format
+        self.issues = []
+        self.counts = dict.fromkeys(SEVERITIES, 0)
+        self.files = 0
+
+    def add(self, issues):
+        for item in issues:
+            self.counts[item["severity"]] += 1
+            if self.output_format == "jsonl":
+                self.output.write(json.dumps(item) + "\n")
+            else:
+                self.issues.append(item)
+
+    def finish(self):
+        summary = dict(files=self.files, **self.counts)
+        if self.output_format == "jsonl":
+            self.output.write(json.dumps({"summary": summary}) + "\n")
+        else:
+            json.dump({"summary": summary, "issues": self.issues}, self.output, indent=2)
+            self.output.write("\n")
+        return summary
+
+
+def lint(paths, output, output_format="json", source_paths=None, jobs=None):
+    report = Report(output, output_format)
+    elements = None
+    if source_paths:
+        elements, errors = source_elements(source_paths, jobs)
+        report.add(errors)
+    documented = {}  # Element ID -> first help file documenting it
+    for path, issues, element_ids in lint_files(list(find_help_files(paths)), jobs):
+        report.files += 1
+        report.add(issues)
+        for element_id in element_ids:
+            documented.setdefault(element_id, path)
+    if elements is not None:
+        report.add(coverage_issues(documented, elements))
+    return report.finish()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate .ftxt help files and check them against the GUI source.")
+    parser.add_argument("paths", nargs="+", help=".ftxt files or directories to check")
+    parser.add_argument("-s", "--source", nargs="+", default=None,
+                        help="Python files or directories whose GUI elements the help should cover")
+    parser.add_argument("--format", choices=["json", "jsonl"], default="json")
+    parser.add_argument("-o", "--output", default=None, help="write the report here instead of stdout")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--strict", action="store_true", help="exit with an error on warnings too")
+    args = parser.parse_args(argv)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            summary = lint(args.paths, output, args.format, args.source, args.jobs)
+    else:
+        summary = lint(args.paths, sys.stdout, args.format, args.source, args.jobs)
+    if summary["error"] or (args.strict and summary["warning"]):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
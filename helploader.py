@@ -0,0 +1,58 @@
+#Loading help files into memory, shared by ContextualHelp and the help daemon.
+#read_help_info picks the cheapest reader for what is on disk: a bundle is loaded shard by shard, a
+#compiled .fhlp file (or a fresh one next to the .ftxt) through its index, and anything else is parsed
+#in full. help_file_signature tells both sides when a help file has to be read again, and source_key is
+#the form in which a client and the daemon name the same file. Nothing here needs Unix domain sockets, so
+#ContextualHelp only imports helpdaemon when it is asked to use one.
+
+import os
+
+from ftxtformat import read_ftxt
+from helpbundle import ShardedHelpInfo, is_bundle, manifest_path
+from helpindex import CompiledHelp, compiled_path, fresh_compiled_path, restructure_help_content
+from helpmodel import entries_from_ftxt
+
+DAEMON_SOCKET_ENV = "HELPGEN_DAEMON_SOCKET"  # Socket of a help daemon to use, see helpdaemon.py
+
+
+def read_help_info(help_file):
+    # A bundle directory or manifest loads each window's shard only when one of its elements is needed
+    if is_bundle(help_file):
+        return ShardedHelpInfo(help_file)
+
+    # A compiled .fhlp file is read lazily through its index instead of parsing everything up front
+    compiled_file = help_file if help_file.endswith(".fhlp") else fresh_compiled_path(help_file)
+    if compiled_file:
+        return CompiledHelp(compiled_file)
+
+    content = read_ftxt(help_file)
+
+    # Restructure the content for easier access
+    return entries_from_ftxt(restructure_help_content(content))
+
+
+def help_file_paths(help_file):
+    # Files whose changes mean the help has to be read again
+    if is_bundle(help_file):
+        return [manifest_path(help_file)]
+    if help_file.endswith(".fhlp"):
+        return [help_file]
+    return [help_file, compiled_path(help_file)]
+
+
+def help_file_signature(help_file):
+    signature = []
+    for path in help_file_paths(help_file):
+        try:
+            stat = os.stat(path)
+            signature.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+
+def source_key(help_file):
+    # Client and daemon may name the same file differently; both send and match this form
+    if is_bundle(help_file):
+        help_file = manifest_path(help_file)
+    return os.path.realpath(help_file)
@@ -0,0 +1,212 @@
+#Compact in-memory model for help documents.
+#.ftxt files describe every line as {"text": ..., "tags": {tag: true, ...}}, which costs two dicts per line
+#once loaded. Here a line is a Line object with __slots__, and its formatting is a Style: an immutable,
+#interned tag set shared by every line and run that uses the same tags. An entry is a tuple of Lines;
+#entries that were never edited stay plain strings, as in the .ftxt files.
+#The *_from_ftxt and *_to_ftxt functions convert between the two without losing anything but the order
+#of tags within a style, which rendering ignores, so the files themselves, the journal and the exporters
+#still see the .ftxt layout.
+#FtxtSerializer writes content held in this model back to .ftxt text, re-serializing only the entries
+#that changed since its previous call.
+
+import hashlib
+import json
+import threading
+
+from ftxtformat import FORMAT_TAG_PREFIXES, FORMAT_VERSION, StyleTable, encode_lines, line_runs
+
+STYLES = {}  # Sorted tuple of tags -> interned Style
+
+
+class Style:
+    __slots__ = ("tags", "format_tags", "tag_dict")
+
+    def __init__(self, tags):
+        object.__setattr__(self, "tags", tags)  # In the .ftxt order first seen
+        object.__setattr__(self, "format_tags", tuple(sorted(tag for tag in tags if tag.startswith(FORMAT_TAG_PREFIXES))))
+        object.__setattr__(self, "tag_dict", dict.fromkeys(tags, True))  # Shared; treat as read-only
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Style objects are immutable")
+
+    def __reduce__(self):
+        return intern_style, (self.tags,)  # Unpickled styles are interned too, so `is` comparisons hold
+
+    def __repr__(self):
+        return f"Style({self.tags!r})"
+
+
+def intern_style(tags):
+    # Tag order does not change the formatting, so {"bold", "italic"} and {"italic", "bold"} share a Style
+    key = tuple(sorted(tags))
+    style = STYLES.get(key)
+    if style is None:
+        style = STYLES[key] = Style(tuple(tags))
+    return style
+
+
+PLAIN = intern_style(())
+
+
+class Run:
+    __slots__ = ("text", "style")
+
+    def __init__(self, text, style=PLAIN):
+        self.text = text
+        self.style = style
+
+    def __eq__(self, other):
+        return isinstance(other, Run) and self.text == other.text and self.style is other.style
+
+
+class Line:
+    # text is the whole line and style its formatting at column 0; runs is None unless the
+    # formatting changes within the line
+    __slots__ = ("text", "style", "runs")
+
+    def __init__(self, text, style=PLAIN, runs=None):
+        self.text = text
+        self.style = style
+        self.runs = runs
+
+    def iter_runs(self):
+        if self.runs:
+            for run in self.runs:
+                yield run.text, run.style
+        else:
+            yield self.text, self.style
+
+    def __eq__(self, other):
+        return (isinstance(other, Line) and self.text == other.text and self.style is other.style
+                and self.runs == other.runs)
+
+    def __repr__(self):
+        return f"Line({self.text!r}, {self.style!r})"
+
+
+def line_from_ftxt(line):
+    runs = line.get("runs")
+    if runs:
+        runs = tuple(Run(run["text"], intern_style(run["tags"])) for run in runs)
+    return Line(line["text"], intern_style(line["tags"]), runs or None)
+
+
+def line_to_ftxt(line):
+    data = {"text": line.text, "tags": line.style.tag_dict}
+    if line.runs:
+        data["runs"] = [{"text": run.text, "tags": run.style.tag_dict} for run in line.runs]
+    return data
+
+
+def lines_from_ftxt(lines):
+    if isinstance(lines, str):
+        return lines
+    return tuple(line if isinstance(line, Line) else line_from_ftxt(line) for line in lines)
+
+
+def lines_to_ftxt(lines):
+    if isinstance(lines, str):
+        return lines
+    return [line_to_ftxt(line) if isinstance(line, Line) else line for line in lines]
+
+
+def entries_from_ftxt(entries):
+    # Element ID -> lines mapping, such as ContextualHelp.help_info
+    return {key: lines_from_ftxt(lines) for key, lines in entries.items()}
+
+
+def entries_to_ftxt(entries):
+    return {key: lines_to_ftxt(lines) for key, lines in entries.items()}
+
+
+def content_from_ftxt(content):
+    # Full .ftxt content ("General" and "MainWindow" sections), as read_ftxt returns it
+    converted = {}
+    for section, data in content.items():
+        if section == "MainWindow" and "elements" in data:
+            converted[section] = dict(data, elements=entries_from_ftxt(data["elements"]))
+        elif section == "General":
+            converted[section] = entries_from_ftxt(data)
+        else:
+            converted[section] = data
+    return converted
+
+
+def content_to_ftxt(content):
+    converted = {}
+    for section, data in content.items():
+        if section == "MainWindow" and "elements" in data:
+            converted[section] = dict(data, elements=entries_to_ftxt(data["elements"]))
+        elif section == "General":
+            converted[section] = entries_to_ftxt(data)
+        else:
+            converted[section] = data
+    return converted
+
+
+def iter_styled_runs(line):
+    # (text, sorted formatting tags) for a Line or an .ftxt line dict
+    if isinstance(line, Line):
+        for text, style in line.iter_runs():
+            yield text, style.format_tags
+    else:
+        for text, tags in line_runs(line):
+            yield text, tuple(sorted(tag for tag in tags if tag.startswith(FORMAT_TAG_PREFIXES)))
+
+
+def content_hash(lines):
+    return hashlib.sha1(json.dumps(lines_to_ftxt(lines), sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class FtxtSerializer:
+    # Entries are immutable (tuples of Lines, or strings), so an entry whose object is the one serialized
+    # last time reuses its cached JSON fragment. The output is identical to ftxtformat.write_ftxt, except
+    # that a version 2 style table can keep styles that are no longer used.
+    def __init__(self):
+        self.fragments = {}  # (version, section, key) -> (lines, JSON text)
+        self.table = StyleTable()  # Style IDs stay stable across calls, so version 2 fragments stay valid
+        self.lock = threading.Lock()
+
+    def fragment(self, used, version, section, key, lines, depth):
+        cache_key = (version, section, key)
+        cached = self.fragments.get(cache_key)
+        if cached is None or cached[0] is not lines:
+            data = lines_to_ftxt(lines)
+            if version == 2:
+                text = json.dumps(encode_lines(data, self.table), separators=(",", ":"), ensure_ascii=False)
+            else:
+                text = json.dumps(data, indent=2).replace("\n", "\n" + "  " * depth)
+            cached = (lines, text)
+        used[cache_key] = cached
+        return cached[1]
+
+    def serialize(self, content, version=1):
+        with self.lock:
+            used = {}
+            general = content.get("General", {})
+            elements = content.get("MainWindow", {}).get("elements", {})
+            if version == 2:
+                general_text = ",".join(f"{json.dumps(key, ensure_ascii=False)}:{self.fragment(used, 2, 'General', key, lines, 0)}"
+                                        for key, lines in general.items())
+                elements_text = ",".join(f"{json.dumps(key, ensure_ascii=False)}:{self.fragment(used, 2, 'MainWindow', key, lines, 0)}"
+                                         for key, lines in elements.items())
+                styles = json.dumps(self.table.styles, separators=(",", ":"), ensure_ascii=False)
+                text = (f'{{"format":"ftxt","version":{FORMAT_VERSION},"styles":{styles},"General":{{{general_text}}},'
+                        f'"MainWindow":{{"elements":{{{elements_text}}}}}}}')
+            else:
+                general_text = v1_object([(key, self.fragment(used, 1, "General", key, lines, 2))
+                                          for key, lines in general.items()], 1)
+                elements_text = v1_object([(key, self.fragment(used, 1, "MainWindow", key, lines, 3))
+                                           for key, lines in elements.items()], 2)
+                text = v1_object([("General", general_text), ("MainWindow", v1_object([("elements", elements_text)], 1))], 0)
+            self.fragments = used  # Forget entries that are gone
+            return text
+
+
+def v1_object(members, depth):
+    # The layout json.dumps(..., indent=2) gives an object at this depth, from already serialized values
+    if not members:
+        return "{}"
+    indent = "\n" + "  " * (depth + 1)
+    return ("{" + ",".join(f"{indent}{json.dumps(key)}: {value}" for key, value in members) +
+            "\n" + "  " * depth + "}")
@@ -0,0 +1,135 @@
+#Render plans for formatted help text.
+#compile_render_plan turns a list of .ftxt lines (see ftxtformat.py) or Line objects (see helpmodel.py)
+#into a RenderPlan: the deduplicated set of style tags the entry needs and a list of (text, tag-tuple)
+#runs. render_plan configures each style tag only once per Text widget, using Font objects shared
+#through a cache keyed by family/size/weight/slant, and inserts the runs with a few bulk
+#Text.insert(END, text1, tags1, text2, tags2, ...) calls, so drawing a long help page costs a handful of
+#Tcl calls instead of several per line.
+
+import weakref
+from tkinter import END, font
+
+from helpmodel import iter_styled_runs
+
+
+INSERT_CHUNK_RUNS = 1000  # Runs per Text.insert call, to keep each Tcl command a reasonable size
+
+
+class RenderPlan:
+    def __init__(self, styles, runs):
+        self.styles = styles  # Style tag name -> tuple of .ftxt tags it stands for
+        self.runs = runs  # List of (text, tuple of style tag names)
+        self.insert_chunks = None
+
+    def get_insert_chunks(self):
+        # Flattened text, tags, text, tags, ... argument lists for bulk Text.insert calls
+        if self.insert_chunks is None:
+            self.insert_chunks = []
+            for start in range(0, len(self.runs), INSERT_CHUNK_RUNS):
+                args = []
+                for text, tags in self.runs[start:start + INSERT_CHUNK_RUNS]:
+                    args.append(text)
+                    args.append(tags)
+                self.insert_chunks.append(args)
+        return self.insert_chunks
+
+
+def compile_render_plan(help_data, composite=True):
+    # composite=True merges each run's tags into one style tag (for display); composite=False keeps
+    # the .ftxt tags themselves on the text so an editor can encode them again
+    styles = {}
+    runs = []
+    for line in help_data:
+        line_start = len(runs)
+        for text, tags in iter_styled_runs(line):
+            if not tags:
+                runs.append((text, ()))
+            elif composite:
+                style_tag = "style:" + ",".join(tags)
+                styles[style_tag] = tags
+                runs.append((text, (style_tag,)))
+            else:
+                for tag in tags:
+                    styles[tag] = (tag,)
+                runs.append((text, tags))
+        if len(runs) == line_start:
+            runs.append(("", ()))
+        text, tags = runs[-1]
+        runs[-1] = (text + "\n", tags)  # The line break carries the formatting of the last run
+    return RenderPlan(styles, merge_runs(runs))
+
+
+def merge_runs(runs):
+    merged = []
+    for text, tags in runs:
+        if merged and merged[-1][1] == tags:
+            merged[-1][0].append(text)
+        else:
+            merged.append(([text], tags))
+    return [("".join(parts), tags) for parts, tags in merged]
+
+
+class FontCache:
+    def __init__(self):
+        self.fonts = weakref.WeakKeyDictionary()  # Tk root -> {(family, size, weight, slant): Font}
+
+    def get(self, widget, family, size, weight="normal", slant="roman"):
+        root_fonts = self.fonts.setdefault(widget._root(), {})
+        key = (family, size, weight, slant)
+        cached = root_fonts.get(key)
+        if cached is None:
+            cached = root_fonts[key] = font.Font(root=widget, family=family, size=size, weight=weight, slant=slant)
+        return cached
+
+
+font_cache = FontCache()
+widget_state = weakref.WeakKeyDictionary()  # Text widget -> (default family, default size, configured tags)
+
+
+def get_widget_state(text_widget):
+    state = widget_state.get(text_widget)
+    if state is None:
+        default_font = font.nametofont(text_widget.cget("font")).actual()
+        state = widget_state[text_widget] = (default_font["family"], default_font["size"], set())
+    return state
+
+
+def style_options(text_widget, tags, default_family, default_size):
+    family, size, weight, slant = default_family, default_size, "normal", "roman"
+    has_font = False
+    options = {}
+    for tag in tags:
+        if tag.startswith("color_"):
+            options["foreground"] = tag[6:]
+        elif tag.startswith("family_"):
+            family = tag[7:]
+            has_font = True
+        elif tag.startswith("size_"):
+            if tag[5:].isdigit():
+                size = int(tag[5:])
+                has_font = True
+        elif tag == "bold":
+            weight = "bold"
+            has_font = True
+        elif tag == "italic":
+            slant = "italic"
+            has_font = True
+        elif tag == "underline":
+            options["underline"] = True
+    if has_font:
+        options["font"] = font_cache.get(text_widget, family, size, weight, slant)
+    return options
+
+
+def configure_styles(text_widget, plan):
+    default_family, default_size, configured = get_widget_state(text_widget)
+    for style_tag, tags in plan.styles.items():
+        if style_tag not in configured:
+            text_widget.tag_configure(style_tag, **style_options(text_widget, tags, default_family, default_size))
+            configured.add(style_tag)
+
+
+def render_plan(text_widget, plan):
+    configure_styles(text_widget, plan)
+    for args in plan.get_insert_chunks():
+        text_widget.insert(END, *args)
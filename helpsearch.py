@@ -0,0 +1,173 @@
+#Full-text and fuzzy search over help content.
+#HelpSearchIndex keeps an inverted index from words to the entries that contain them and ranks
+#results with BM25, with extra weight for words in the element name and prefix matching for the
+#last word typed. resolve_id maps near-miss widget names, such as name_1 suffixes added by the
+#generator or Tk paths like .!frame.!button2, onto existing element IDs. It only needs the names, so
+#HelpIdIndex does it on its own, without reading any help text.
+
+import bisect
+import math
+import re
+
+from helpmodel import Line
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+SUFFIX_RE = re.compile(r"(_\d+|\d+)$")
+NAME_WEIGHT = 3  # A word in the element name counts as much as this many words in its text
+K1 = 1.2
+B = 0.75
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+def entry_text(content):
+    if isinstance(content, str):
+        return content
+    return "\n".join(line.text if isinstance(line, Line) else line.get("text", "")
+                     for line in content if isinstance(line, (Line, dict)))
+
+
+def normalize_id(element_id):
+    # ".!frame.!button2" -> "button", "file_entry_1" -> "file_entry"
+    name = element_id.rsplit(".", 1)[-1].lstrip("!").lower()
+    return SUFFIX_RE.sub("", name) or name
+
+
+def trigrams(text):
+    text = f"  {text} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class HelpIdIndex:
+    def __init__(self, keys=()):
+        self.names = {}  # Key -> element name
+        self.normalized = {}  # Normalized name -> [keys]
+        self.name_trigrams = {}  # Trigram -> set of keys
+        for key in keys:
+            self.add(key, key)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, key):
+        return key in self.names
+
+    def add(self, key, name):
+        if key in self.names:
+            self.remove(key)
+        self.names[key] = name
+        self.normalized.setdefault(normalize_id(name), []).append(key)
+        for trigram in trigrams(name.lower()):
+            self.name_trigrams.setdefault(trigram, set()).add(key)
+
+    def remove(self, key):
+        name = self.names.pop(key, None)
+        if name is None:
+            return
+        same_name = self.normalized.get(normalize_id(name), [])
+        if key in same_name:
+            same_name.remove(key)
+        for trigram in trigrams(name.lower()):
+            self.name_trigrams.get(trigram, set()).discard(key)
+
+    def resolve_id(self, element_id, cutoff=0.5):
+        if element_id in self.names:
+            return element_id
+        candidates = self.normalized.get(normalize_id(element_id))
+        if candidates:
+            return candidates[0]
+
+        # Closest element name by trigram similarity
+        query = trigrams(normalize_id(element_id))
+        overlap = {}
+        for trigram in query:
+            for key in self.name_trigrams.get(trigram, ()):
+                overlap[key] = overlap.get(key, 0) + 1
+        best_key, best_score = None, cutoff
+        for key, shared in overlap.items():
+            score = shared / len(query | trigrams(self.names[key].lower()))
+            if score > best_score:
+                best_key, best_score = key, score
+        return best_key
+
+
+class HelpSearchIndex:
+    def __init__(self):
+        self.postings = {}  # Word -> {key: weighted term frequency}
+        self.lengths = {}  # Key -> weighted number of words
+        self.words = {}  # Key -> words it is posted under, so remove does not scan the vocabulary
+        self.ids = HelpIdIndex()  # Element names, for resolve_id
+        self.total_length = 0
+        self.vocabulary = None  # Sorted words, rebuilt on demand for prefix matching
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def add(self, key, name, content):
+        if key in self.lengths:
+            self.remove(key)
+        counts = {}
+        for word in tokenize(entry_text(content)):
+            counts[word] = counts.get(word, 0) + 1
+        for word in tokenize(name):
+            counts[word] = counts.get(word, 0) + NAME_WEIGHT
+        for word, count in counts.items():
+            postings = self.postings.get(word)
+            if postings is None:
+                postings = self.postings[word] = {}
+                self.vocabulary = None
+            postings[key] = count
+        self.words[key] = tuple(counts)
+        length = sum(counts.values())
+        self.lengths[key] = length
+        self.total_length += length
+        self.ids.add(key, name)
+
+    def remove(self, key):
+        length = self.lengths.pop(key, None)
+        if length is None:
+            return
+        self.total_length -= length
+        for word in self.words.pop(key):
+            postings = self.postings[word]
+            del postings[key]
+            if not postings:
+                del self.postings[word]
+                self.vocabulary = None
+        self.ids.remove(key)
+
+    def expand(self, word, prefix):
+        if not prefix:
+            return [(word, 1.0)] if word in self.postings else []
+        if self.vocabulary is None:
+            self.vocabulary = sorted(self.postings)
+        matches = []
+        i = bisect.bisect_left(self.vocabulary, word)
+        while i < len(self.vocabulary) and self.vocabulary[i].startswith(word):
+            candidate = self.vocabulary[i]
+            matches.append((candidate, 1.0 if candidate == word else 0.5))
+            i += 1
+        return matches
+
+    def search(self, query, limit=20):
+        words = tokenize(query)
+        if not words or not self.lengths:
+            return []
+        count = len(self.lengths)
+        average_length = self.total_length / count
+        scores = {}
+        for position, word in enumerate(words):
+            # The last word may still be being typed, so it also matches as a prefix
+            for term, weight in self.expand(word, position == len(words) - 1):
+                postings = self.postings[term]
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for key, frequency in postings.items():
+                    norm = K1 * (1 - B + B * self.lengths[key] / average_length)
+                    scores[key] = scores.get(key, 0.0) + weight * idf * frequency * (K1 + 1) / (frequency + norm)
+        ranked = sorted(scores.items(), key=lambda item: -item[1])
+        return ranked[:limit]
+
+    def resolve_id(self, element_id, cutoff=0.5):
+        return self.ids.resolve_id(element_id, cutoff)
@@ -0,0 +1,148 @@
+#Opt-in timing instrumentation for the generator and the help system.
+#Set HELPGEN_STATS=1 to record how long each phase takes (parse, extract, tree update, encode, save,
+#help load, lookup, render, window open). Every phase keeps a count, total, min, max and a latency
+#histogram. stats.snapshot() returns them as a dict; with HELPGEN_STATS_FILE=path they are also
+#written to that file as JSON when the process exits.
+#stats.mark(event) adds a point to a timeline measured from the moment helpstats was imported; the
+#generator uses it to report its startup. The timeline is written with the phases.
+#When disabled, stats.timer returns a shared no-op context manager, so instrumented code pays for one
+#attribute check per phase.
+#
+#Usage:
+#    from helpstats import stats
+#    with stats.timer("render"):
+#        ...
+#    stats.record("parse", seconds)
+#    stats.mark("first_window")
+
+import atexit
+import bisect
+import json
+import os
+import threading
+import time
+
+STATS_ENV = "HELPGEN_STATS"
+STATS_FILE_ENV = "HELPGEN_STATS_FILE"
+# Histogram bucket upper bounds in milliseconds; the last bucket counts everything slower
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+class PhaseStats:
+    __slots__ = ("count", "total", "min", "max", "histogram")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+        self.histogram = [0] * (len(BUCKETS_MS) + 1)
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        self.histogram[bisect.bisect_left(BUCKETS_MS, seconds * 1000)] += 1
+
+    def as_dict(self):
+        labels = [f"<={bound}ms" for bound in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}ms"]
+        return {
+            "count": self.count,
+            "total_ms": self.total * 1000,
+            "mean_ms": self.total * 1000 / self.count if self.count else 0.0,
+            "min_ms": (self.min or 0.0) * 1000,
+            "max_ms": self.max * 1000,
+            "histogram": {label: count for label, count in zip(labels, self.histogram) if count}
+        }
+
+
+class NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NULL_TIMER = NullTimer()
+
+
+class PhaseTimer:
+    __slots__ = ("stats", "phase", "start")
+
+    def __init__(self, stats, phase):
+        self.stats = stats
+        self.phase = phase
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stats.record(self.phase, time.perf_counter() - self.start)
+        return False
+
+
+class HelpStats:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.phases = {}
+        self.timeline = []  # (event, milliseconds since started)
+        self.started = time.perf_counter()
+        self.lock = threading.Lock()  # Saves are timed on the journal thread
+
+    def timer(self, phase):
+        if not self.enabled:
+            return NULL_TIMER
+        return PhaseTimer(self, phase)
+
+    def record(self, phase, seconds):
+        if not self.enabled:
+            return
+        with self.lock:
+            phase_stats = self.phases.get(phase)
+            if phase_stats is None:
+                phase_stats = self.phases[phase] = PhaseStats()
+            phase_stats.add(seconds)
+
+    def mark(self, event):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.timeline.append((event, (time.perf_counter() - self.started) * 1000))
+
+    def format_timeline(self):
+        with self.lock:
+            return "\n".join(f"{elapsed:9.1f} ms  {event}" for event, elapsed in self.timeline)
+
+    def snapshot(self):
+        with self.lock:
+            return {phase: phase_stats.as_dict() for phase, phase_stats in sorted(self.phases.items())}
+
+    def reset(self):
+        with self.lock:
+            self.phases = {}
+            self.timeline = []
+
+    def dump(self, path):
+        with self.lock:
+            timeline = [{"event": event, "ms": elapsed} for event, elapsed in self.timeline]
+        with open(path, "w") as file:
+            json.dump({"pid": os.getpid(), "phases": self.snapshot(), "timeline": timeline}, file, indent=2)
+
+
+stats = HelpStats(os.environ.get(STATS_ENV, "") not in ("", "0"))
+
+
+def dump_at_exit():
+    path = os.environ.get(STATS_FILE_ENV)
+    if path and (stats.phases or stats.timeline):
+        try:
+            stats.dump(path)
+        except OSError:
+            pass
+
+
+if stats.enabled:
+    atexit.register(dump_at_exit)